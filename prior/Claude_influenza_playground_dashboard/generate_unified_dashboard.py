@@ -10,127 +10,33 @@ Combines all three dashboards into one comprehensive HTML file:
 Navigation between sections via smooth scrolling.
 """
 
+import csv
 import json
-import pandas as pd
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from html import escape as html_escape
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-def main():
-    """Generate unified single-page dashboard."""
-    print("="*70)
-    print("Unified Influenza Dashboard Generator")
-    print("="*70)
-
-    # Load data
-    with open("output/studies.json", 'r') as f:
-        studies = json.load(f)
-
-    biodata_df = pd.read_csv("output/biodata_matrix.csv")
-
-    # Try to load PubMed findings
-    try:
-        pubmed_df = pd.read_csv("output/pubmed_findings.csv")
-        print("  ✓ Loaded PubMed findings")
-
-        # Create a lookup dictionary for findings by publication
-        findings_lookup = {}
-        for _, row in pubmed_df.iterrows():
-            key = f"{row['first_author']}_{row['year']}"
-            findings_lookup[key] = row['findings_summary']
-
-        questions_df = pd.read_csv("output/research_questions.csv")
-
-        # Add findings to questions dataframe
-        questions_df['findings'] = questions_df.apply(
-            lambda row: findings_lookup.get(
-                f"{row['Publication'].split('(')[0].strip().replace(' et al.', '')}_{row['Publication'].split('(')[-1].replace(')', '')}",
-                ''
-            ),
-            axis=1
-        )
-        print("  ✓ Merged PubMed findings with research questions")
-    except FileNotFoundError:
-        questions_df = pd.read_csv("output/research_questions.csv")
-        questions_df['findings'] = ''
-        print("  ✓ Loaded research questions (no PubMed findings available)")
-
-    # Calculate stats
-    total_studies = len(studies)
-    total_subjects = sum(s.get('experimental_design', {}).get('subjects', 0) or 0 for s in studies)
-    total_samples = sum(
-        sum(sample.get('count', 0) for sample in s.get('experimental_design', {}).get('sample_types', []))
-        for s in studies
-    )
-    total_publications = sum(len(s.get('publications', [])) for s in studies)
-
-    # Extract biodata columns
-    all_cols = biodata_df.columns.tolist()
-    sample_cols = [c for c in all_cols if c.startswith('Sample: ')]
-    assay_cols = [c for c in all_cols if c.startswith('Assay: ')]
-    data_cols = [c for c in all_cols if c.startswith('Data: ')]
-
-    sample_types = [c.replace('Sample: ', '') for c in sample_cols]
-    assays = [c.replace('Assay: ', '') for c in assay_cols]
-    datasets = [c.replace('Data: ', '') for c in data_cols]
-
-    # Group research questions
-    research_categories = {}
-
-    # Handle PDF-based analysis format
-    if 'study_type' in questions_df.columns:
-        for study_type in questions_df['study_type'].unique():
-            type_data = questions_df[questions_df['study_type'] == study_type]
-            research_categories[study_type] = {
-                'question': f"Research using {study_type.lower()} approaches",
-                'publications': type_data.to_dict('records')
-            }
-    # Handle title-based analysis format
-    elif 'Research Question Category' in questions_df.columns:
-        for category in questions_df['Research Question Category'].unique():
-            category_data = questions_df[questions_df['Research Question Category'] == category]
-            research_categories[category] = {
-                'question': category_data.iloc[0]['Question'],
-                'publications': category_data.to_dict('records')
-            }
-
-    print(f"\nLoaded:")
-    print(f"  • {total_studies} influenza studies")
-    print(f"  • {len(sample_types)} sample types")
-    print(f"  • {len(assays)} molecular assays")
-    print(f"  • {len(research_categories)} research question categories")
-
-    # Generate HTML (inline to keep it simple)
-    html = generate_html(studies, total_studies, total_subjects, total_samples, total_publications,
-                        biodata_df, sample_types, assays, datasets, research_categories)
-
-    # Write output
-    output_path = Path("output/unified_dashboard.html")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-
-    file_size = output_path.stat().st_size / 1024
-    print(f"\n✓ Unified dashboard generated: {output_path}")
-    print(f"✓ File size: {file_size:.1f} KB")
-    print(f"✓ Single HTML file - ready to share!")
-
-    print("\n" + "="*70)
-    print("Dashboard Features:")
-    print("="*70)
-    print("  1. Navigation menu to jump between sections")
-    print("  2. Study Overview with sortable summary table")
-    print("  3. Biodata Availability Matrix (presence/absence)")
-    print("  4. Research Questions mapped to datasets")
-    print("  5. Detailed study cards with full information")
-    print("\n" + "="*70)
+STUDIES_PATH = Path("output/studies.json")
 
+# Same replacements as html.escape(quote=True), applied in a single pass
+_HTML_ESC = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+_NEEDS_ESCAPE = re.compile(r'[&<>"\']')
 
-def generate_html(studies, total_studies, total_subjects, total_samples, total_publications,
-                 biodata_df, sample_types, assays, datasets, research_categories):
-    """Generate the complete HTML."""
 
-    # Start HTML
-    html = """<!DOCTYPE html>
+# Static <head>, CSS and page header - identical on every run
+DASHBOARD_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -503,23 +409,25 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
                 <a href="#questions">🔬 Research Questions</a>
                 <a href="#studies">📚 Detailed Studies</a>
             </nav>
-        </header>
+        </header>"""
+
+STATS_AND_OVERVIEW_TMPL = """
 
         <div class="stats-grid">
             <div class="stat-card">
-                <span class="stat-number">""" + str(total_studies) + """</span>
+                <span class="stat-number">{total_studies}</span>
                 <span class="stat-label">Influenza Studies</span>
             </div>
             <div class="stat-card">
-                <span class="stat-number">""" + str(total_subjects) + """</span>
+                <span class="stat-number">{total_subjects}</span>
                 <span class="stat-label">Total Subjects</span>
             </div>
             <div class="stat-card">
-                <span class="stat-number">""" + str(total_samples) + """</span>
+                <span class="stat-number">{total_samples}</span>
                 <span class="stat-label">Total Samples</span>
             </div>
             <div class="stat-card">
-                <span class="stat-number">""" + str(total_publications) + """</span>
+                <span class="stat-number">{total_publications}</span>
                 <span class="stat-label">Publications</span>
             </div>
         </div>
@@ -548,25 +456,271 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
                     </thead>
                     <tbody>"""
 
-    # Add study rows
-    for study in studies:
-        exp_design = study['experimental_design']
-        total_study_samples = sum(s['count'] for s in exp_design['sample_types'])
-        sample_types_list = [s['type'] for s in exp_design['sample_types']]
-
-        html += f"""
+SUMMARY_ROW_TMPL = """
                         <tr>
-                            <td><strong>{study['title']}</strong></td>
-                            <td><span class="strain-badge">{study['strain']}</span></td>
-                            <td><span class="study-type-badge">{study['study_type']}</span></td>
-                            <td>{exp_design.get('subjects', 'N/A')}</td>
-                            <td>{exp_design.get('timepoints', 'N/A')}</td>
-                            <td><strong>{total_study_samples:,}</strong></td>
-                            <td>{len(study['publications'])}</td>
-                            <td><button class="expand-btn" onclick="scrollToStudy('{study['id']}')">View Details</button></td>
+                            <td><strong>{title}</strong></td>
+                            <td><span class="strain-badge">{strain}</span></td>
+                            <td><span class="study-type-badge">{study_type}</span></td>
+                            <td>{subjects}</td>
+                            <td>{timepoints}</td>
+                            <td><strong>{total_samples:,}</strong></td>
+                            <td>{pub_count}</td>
+                            <td><button class="expand-btn" onclick="scrollToStudy('{id}')">View Details</button></td>
                         </tr>"""
 
-    html += """
+STUDY_AIMS_TMPL = """
+                    <div class="study-aims">
+                        <strong>Research Aims:</strong><br>
+                        {research_aims}
+                    </div>"""
+
+CARD_TMPL = """
+                <div class="study-card" id="study-{id}">
+                    <h3 class="study-title">{title}</h3>
+                    <div class="study-badges">
+                        <span class="strain-badge">{strain}</span>
+                        <span class="study-type-badge">{study_type}</span>
+                    </div>{aims_html}
+                    <div class="design-grid">
+                        <div class="design-item">
+                            <div class="design-label">Subjects</div>
+                            <div class="design-value">{subjects}</div>
+                        </div>
+                        <div class="design-item">
+                            <div class="design-label">Timepoints</div>
+                            <div class="design-value">{timepoints}</div>
+                        </div>
+                        <div class="design-item">
+                            <div class="design-label">Sample Types</div>
+                            <div class="design-value">{n_sample_types}</div>
+                        </div>
+                        <div class="design-item">
+                            <div class="design-label">Total Samples</div>
+                            <div class="design-value">{total_samples:,}</div>
+                        </div>
+                    </div>"""
+
+PUB_TMPL = """
+                    <div class="pub-item">
+                        <div class="pub-study">📊 Dataset: {dataset}</div>
+                        <div class="pub-title">{title}</div>{findings_html}
+                        <div class="pub-citation">{citation}</div>
+                        <a href="{url}" target="_blank" class="pub-link">View Publication →</a>
+                    </div>"""
+
+FINDINGS_TMPL = """
+                        <div class="pub-findings">
+                            <strong>Key Findings:</strong> {}
+                        </div>"""
+
+
+def project_study(study):
+    """Extract the fields rendered for a study in the summary table and study cards."""
+    exp_design = study['experimental_design']
+    return {
+        'id': study['id'],
+        'title': study['title'],
+        'strain': esc_cached(study['strain']),
+        'study_type': esc_cached(study['study_type']),
+        'research_aims': study['research_aims'],
+        'subjects': exp_design.get('subjects', 'N/A'),
+        'timepoints': exp_design.get('timepoints', 'N/A'),
+        'n_sample_types': len(exp_design['sample_types']),
+        'total_samples': sum(s['count'] for s in exp_design['sample_types']),
+        'pub_count': len(study['publications']),
+    }
+
+
+def esc(value):
+    """HTML-escape a value for rendering, skipping strings with no metacharacters."""
+    s = str(value)
+    return s.translate(_HTML_ESC) if _NEEDS_ESCAPE.search(s) else s
+
+
+@lru_cache(maxsize=4096, typed=True)
+def esc_cached(value):
+    """Cached esc for recurring low-cardinality values (strain, study type, author)."""
+    return esc(value)
+
+
+def load_study_rows(path):
+    """Stream studies.json and return the projected study rows plus subject and sample counts.
+
+    Only one raw study is resident at a time; each study's sample total is reduced
+    once in project_study and reused by the overall stat, the summary table and
+    the study cards.
+    """
+    study_rows = []
+    subject_counts = []
+    sample_counts = []
+    for study in iter_studies(path):
+        row = project_study(study)
+        subject_counts.append(study['experimental_design'].get('subjects', 0) or 0)
+        sample_counts.append(row['total_samples'])
+        study_rows.append(row)
+    return study_rows, subject_counts, sample_counts
+
+
+def load_biodata(path):
+    """Read the biodata matrix as a header list and a list of row lists."""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        biodata_cols = next(reader)
+        return biodata_cols, list(reader)
+
+
+def load_findings_lookup(path):
+    """Map "<first_author>_<year>" to the PubMed findings summary."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return {
+            f"{row['first_author']}_{row['year']}": row['findings_summary']
+            for row in csv.DictReader(f)
+        }
+
+
+def load_csv_rows(path):
+    """Read a CSV file into a list of row dicts."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def iter_studies(path):
+    """Yield studies from studies.json one at a time, streaming with ijson when available."""
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'item')
+        else:
+            yield from json.load(f)
+
+
+def main():
+    """Generate unified single-page dashboard."""
+    print("="*70)
+    print("Unified Influenza Dashboard Generator")
+    print("="*70)
+
+    # Load data - the four inputs are independent, so their reads are overlapped
+    # on a small thread pool
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        f_studies = ex.submit(load_study_rows, STUDIES_PATH)
+        f_biodata = ex.submit(load_biodata, "output/biodata_matrix.csv")
+        f_pubmed = ex.submit(load_findings_lookup, "output/pubmed_findings.csv")
+        f_questions = ex.submit(load_csv_rows, "output/research_questions.csv")
+
+    study_rows, subject_counts, sample_counts = f_studies.result()
+    biodata_cols, biodata_rows = f_biodata.result()
+    sample_cols = [c for c in biodata_cols if c.startswith('Sample: ')]
+    assay_cols = [c for c in biodata_cols if c.startswith('Assay: ')]
+    data_cols = [c for c in biodata_cols if c.startswith('Data: ')]
+
+    # Try to load PubMed findings
+    try:
+        findings_lookup = f_pubmed.result()
+        print("  ✓ Loaded PubMed findings")
+
+        questions = f_questions.result()
+
+        # Add findings to each research question
+        for row in questions:
+            pub = row['Publication']
+            key = f"{pub.split('(')[0].strip().replace(' et al.', '')}_{pub.split('(')[-1].replace(')', '')}"
+            row['findings'] = findings_lookup.get(key, '')
+        print("  ✓ Merged PubMed findings with research questions")
+    except FileNotFoundError:
+        questions = f_questions.result()
+        for row in questions:
+            row['findings'] = ''
+        print("  ✓ Loaded research questions (no PubMed findings available)")
+
+    # Calculate stats
+    total_studies = len(study_rows)
+    total_subjects = sum(subject_counts)
+    total_samples = sum(sample_counts)
+    total_publications = sum(row['pub_count'] for row in study_rows)
+
+    # Extract biodata column labels
+    sample_types = [c.replace('Sample: ', '') for c in sample_cols]
+    assays = [c.replace('Assay: ', '') for c in assay_cols]
+    datasets = [c.replace('Data: ', '') for c in data_cols]
+
+    # Group research questions, keeping categories in first-seen order
+    research_categories = {}
+    question_cols = questions[0].keys() if questions else ()
+
+    # Handle PDF-based analysis format
+    if 'study_type' in question_cols:
+        for row in questions:
+            study_type = row['study_type']
+            if not study_type:
+                continue
+            if study_type not in research_categories:
+                research_categories[study_type] = {
+                    'question': f"Research using {study_type.lower()} approaches",
+                    'publications': []
+                }
+            research_categories[study_type]['publications'].append(row)
+    # Handle title-based analysis format
+    elif 'Research Question Category' in question_cols:
+        for row in questions:
+            category = row['Research Question Category']
+            if not category:
+                continue
+            if category not in research_categories:
+                research_categories[category] = {
+                    'question': row['Question'],
+                    'publications': []
+                }
+            research_categories[category]['publications'].append(row)
+
+    print(f"\nLoaded:")
+    print(f"  • {total_studies} influenza studies")
+    print(f"  • {len(sample_types)} sample types")
+    print(f"  • {len(assays)} molecular assays")
+    print(f"  • {len(research_categories)} research question categories")
+
+    # Generate HTML (inline to keep it simple) and stream it straight to disk
+    html_fragments = generate_html(study_rows, STUDIES_PATH, total_studies, total_subjects, total_samples,
+                                   total_publications, biodata_cols, biodata_rows, sample_types, assays, datasets,
+                                   research_categories)
+
+    # Write output
+    output_path = Path("output/unified_dashboard.html")
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.writelines(html_fragments)
+
+    file_size = output_path.stat().st_size / 1024
+    print(f"\n✓ Unified dashboard generated: {output_path}")
+    print(f"✓ File size: {file_size:.1f} KB")
+    print(f"✓ Single HTML file - ready to share!")
+
+    print("\n" + "="*70)
+    print("Dashboard Features:")
+    print("="*70)
+    print("  1. Navigation menu to jump between sections")
+    print("  2. Study Overview with sortable summary table")
+    print("  3. Biodata Availability Matrix (presence/absence)")
+    print("  4. Research Questions mapped to datasets")
+    print("  5. Detailed study cards with full information")
+    print("\n" + "="*70)
+
+
+def generate_html(study_rows, studies_path, total_studies, total_subjects, total_samples, total_publications,
+                 biodata_cols, biodata_rows, sample_types, assays, datasets, research_categories):
+    """Generate the complete HTML, yielding it fragment by fragment."""
+
+    # Start HTML - fragments are yielded so the caller can write them as they are produced
+    yield DASHBOARD_HEAD
+    yield STATS_AND_OVERVIEW_TMPL.format(
+        total_studies=total_studies,
+        total_subjects=total_subjects,
+        total_samples=total_samples,
+        total_publications=total_publications,
+    )
+
+    # Add study rows
+    yield from (SUMMARY_ROW_TMPL.format_map(row) for row in study_rows)
+
+    yield """
                     </tbody>
                 </table>
             </div>
@@ -589,11 +743,11 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
                             <th class="section-header-th" colspan=\"""" + str(len(sample_types)) + """\">SAMPLE TYPES</th>"""
 
     if assays:
-        html += '<th class="section-header-th" colspan="' + str(len(assays)) + '">MOLECULAR ASSAYS</th>'
+        yield '<th class="section-header-th" colspan="' + str(len(assays)) + '">MOLECULAR ASSAYS</th>'
     if datasets:
-        html += '<th class="section-header-th" colspan="' + str(len(datasets)) + '">DATASETS</th>'
+        yield '<th class="section-header-th" colspan="' + str(len(datasets)) + '">DATASETS</th>'
 
-    html += """
+    yield """
                         </tr>
                         <tr>
                             <th class="study-col"></th>
@@ -601,48 +755,37 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
 
     # Add column headers
     for st in sample_types:
-        html += f'<th class="rotate">{st}</th>'
+        yield f'<th class="rotate">{st}</th>'
     for assay in assays:
-        html += f'<th class="rotate">{assay}</th>'
+        yield f'<th class="rotate">{assay}</th>'
     for ds in datasets:
-        html += f'<th class="rotate">{ds[:30]}</th>'
+        yield f'<th class="rotate">{ds[:30]}</th>'
 
-    html += """
+    yield """
                         </tr>
                     </thead>
                     <tbody>"""
 
-    # Add biodata rows
-    for _, row in biodata_df.iterrows():
-        html += f"""
+    # Add biodata rows - resolve column positions once, then index each row by integer
+    col_idx = {c: i for i, c in enumerate(biodata_cols)}
+    value_idx = ([col_idx[f'Sample: {st}'] for st in sample_types] +
+                 [col_idx[f'Assay: {assay}'] for assay in assays] +
+                 [col_idx[f'Data: {ds}'] for ds in datasets])
+    title_idx = col_idx['Study Title']
+    subj_idx = col_idx['Subjects']
+
+    for row in biodata_rows:
+        title = row[title_idx]
+        subjects = row[subj_idx]
+        yield f"""
                         <tr>
-                            <td class="study-cell">{row['Study Title']}</td>
-                            <td>{row['Subjects']}</td>"""
-
-        # Sample types
-        for st in sample_types:
-            val = row[f'Sample: {st}']
-            cell_class = 'cell-present' if val == 1 else 'cell-absent'
-            symbol = '✓' if val == 1 else '✗'
-            html += f'<td class="{cell_class}">{symbol}</td>'
-
-        # Assays
-        for assay in assays:
-            val = row[f'Assay: {assay}']
-            cell_class = 'cell-present' if val == 1 else 'cell-absent'
-            symbol = '✓' if val == 1 else '✗'
-            html += f'<td class="{cell_class}">{symbol}</td>'
-
-        # Datasets
-        for ds in datasets:
-            val = row[f'Data: {ds}']
-            cell_class = 'cell-present' if val == 1 else 'cell-absent'
-            symbol = '✓' if val == 1 else '✗'
-            html += f'<td class="{cell_class}">{symbol}</td>'
-
-        html += '</tr>'
-
-    html += """
+                            <td class="study-cell">{title}</td>
+                            <td>{subjects}</td>"""
+        yield ''.join('<td class="cell-present">✓</td>' if row[i] == '1' else '<td class="cell-absent">✗</td>'
+                      for i in value_idx)
+        yield '</tr>'
+
+    yield """
                     </tbody>
                 </table>
             </div>
@@ -658,9 +801,9 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
     # Add research question categories
     for category, data in sorted(research_categories.items()):
         pub_count = len(data['publications'])
-        category_escaped = html_escape(str(category))
-        question_escaped = html_escape(str(data['question']))
-        html += f"""
+        category_escaped = esc(category)
+        question_escaped = esc(data['question'])
+        yield f"""
             <div class="question-section">
                 <div class="question-header">
                     <h3>{category_escaped} ({pub_count} publications)</h3>
@@ -673,15 +816,12 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
             if 'study_title' in pub:
                 dataset = f"{pub['study_title']} ({pub['study_strain']})"
                 title = pub['title']
-                citation = f"{pub['first_author']} et al. {pub['journal']} ({pub['year']})"
+                # csv reads a blank journal as '', which is left out of the citation
+                journal = f" {pub['journal']}" if pub['journal'] else ''
+                citation = f"{pub['first_author']} et al.{journal} ({pub['year']})"
                 url = pub['url']
                 research_q = pub.get('research_question', '')
                 findings = pub.get('findings', '')
-                # Handle NaN values from pandas
-                if isinstance(research_q, float):
-                    research_q = ''
-                if isinstance(findings, float):
-                    findings = ''
             # Handle title-based analysis format
             else:
                 dataset = pub.get('Study Dataset', '')
@@ -690,40 +830,22 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
                 url = pub.get('URL', '')
                 research_q = ''
                 findings = pub.get('findings', '')
-                # Handle NaN values
-                if isinstance(findings, float):
-                    findings = ''
-
-            # Escape HTML entities for proper rendering
-            dataset_escaped = html_escape(str(dataset))
-            title_escaped = html_escape(str(title))
-            citation_escaped = html_escape(str(citation))
-
-            html_content = f"""
-                    <div class="pub-item">
-                        <div class="pub-study">📊 Dataset: {dataset_escaped}</div>
-                        <div class="pub-title">{title_escaped}</div>"""
-
-            # Add findings summary if available
-            if findings and len(str(findings).strip()) > 0:
-                findings_escaped = html_escape(str(findings))
-                html_content += f"""
-                        <div class="pub-findings">
-                            <strong>Key Findings:</strong> {findings_escaped}
-                        </div>"""
-
-            html_content += f"""
-                        <div class="pub-citation">{citation_escaped}</div>
-                        <a href="{url}" target="_blank" class="pub-link">View Publication →</a>
-                    </div>"""
 
-            html += html_content
-
-        html += """
+            # Escape HTML entities and render the whole item with one format call
+            findings_html = FINDINGS_TMPL.format(esc(findings)) if findings.strip() else ''
+            yield PUB_TMPL.format(
+                dataset=esc(dataset),
+                title=esc(title),
+                findings_html=findings_html,
+                citation=esc(citation),
+                url=url,
+            )
+
+        yield """
                 </div>
             </div>"""
 
-    html += """
+    yield """
         </section>
 
         <!-- SECTION 4: DETAILED STUDY CARDS -->
@@ -736,66 +858,31 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
 
             <div class="study-cards">"""
 
-    # Add detailed study cards
-    for study in studies:
-        exp_design = study['experimental_design']
-        total_study_samples = sum(s['count'] for s in exp_design['sample_types'])
-
-        html += f"""
-                <div class="study-card" id="study-{study['id']}">
-                    <h3 class="study-title">{study['title']}</h3>
-                    <div class="study-badges">
-                        <span class="strain-badge">{study['strain']}</span>
-                        <span class="study-type-badge">{study['study_type']}</span>
-                    </div>"""
-
-        if study['research_aims']:
-            html += f"""
-                    <div class="study-aims">
-                        <strong>Research Aims:</strong><br>
-                        {study['research_aims']}
-                    </div>"""
-
-        html += f"""
-                    <div class="design-grid">
-                        <div class="design-item">
-                            <div class="design-label">Subjects</div>
-                            <div class="design-value">{exp_design.get('subjects', 'N/A')}</div>
-                        </div>
-                        <div class="design-item">
-                            <div class="design-label">Timepoints</div>
-                            <div class="design-value">{exp_design.get('timepoints', 'N/A')}</div>
-                        </div>
-                        <div class="design-item">
-                            <div class="design-label">Sample Types</div>
-                            <div class="design-value">{len(exp_design['sample_types'])}</div>
-                        </div>
-                        <div class="design-item">
-                            <div class="design-label">Total Samples</div>
-                            <div class="design-value">{total_study_samples:,}</div>
-                        </div>
-                    </div>"""
+    # Add detailed study cards - second streaming pass for the publication lists
+    for row, study in zip(study_rows, iter_studies(studies_path)):
+        aims_html = STUDY_AIMS_TMPL.format_map(row) if row['research_aims'] else ''
+        yield CARD_TMPL.format(aims_html=aims_html, **row)
 
         if study['publications']:
-            html += f"""
+            yield f"""
                     <div style="margin-top: 25px; padding-top: 25px; border-top: 2px solid #f0f0f0;">
-                        <h4 style="margin-bottom: 15px; color: #2d3748;">Publications ({len(study['publications'])})</h4>"""
+                        <h4 style="margin-bottom: 15px; color: #2d3748;">Publications ({row['pub_count']})</h4>"""
 
             for pub in study['publications']:
-                html += f"""
+                yield f"""
                         <div style="margin-bottom: 12px; padding: 15px; background: #f8f9fa; border-radius: 8px;">
-                            <div style="font-weight: 600; color: #2d3748; margin-bottom: 5px;">{pub['first_author']} et al.</div>
+                            <div style="font-weight: 600; color: #2d3748; margin-bottom: 5px;">{esc_cached(pub['first_author'])} et al.</div>
                             <a href="{pub['url']}" target="_blank" style="color: #667eea; text-decoration: none; display: block; margin-bottom: 5px;">{pub['title']}</a>
                             <div style="color: #666; font-size: 0.9em; font-style: italic;">{pub['journal']} ({pub['year']})</div>
                         </div>"""
 
-            html += """
+            yield """
                     </div>"""
 
-        html += """
+        yield """
                 </div>"""
 
-    html += """
+    yield """
             </div>
         </section>
 
@@ -867,8 +954,6 @@ def generate_html(studies, total_studies, total_subjects, total_samples, total_p
 </body>
 </html>"""
 
-    return html
-
 
 if __name__ == "__main__":
     main()
@@ -7,10 +7,17 @@ and extracts structured findings (methods/results) to summarize
 in 1-3 sentences.
 """
 
+import hashlib
 import json
+import os
+import sqlite3
+import sys
 import time
 import re
-from typing import Dict, List, Optional
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 from pathlib import Path
 
@@ -21,16 +28,188 @@ except ImportError:
     subprocess.check_call(['pip', 'install', 'requests'])
     import requests
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# orjson parses E-utilities JSON several times faster than the stdlib when installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+CACHE_PATH = "output/pubmed_cache.sqlite"
+SECTION_SCAN_LIMIT = 1000  # Characters of a results/conclusions section scanned for sentences
+
+# Regex patterns are compiled once at import and shared by every lookup
+_PUBMED_HOST = 'pubmed.ncbi.nlm.nih.gov/'
+_PMID_URL_RE = re.compile(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)')
+_PMC_URL_RE = re.compile(r'/pmc/articles/PMC(\d+)')
+_XML_TAG_RE = re.compile(r'<[^>]+>')
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_ARTICLE_RE = re.compile(r'<PubmedArticle\b[^>]*>.*?</PubmedArticle>', re.DOTALL)
+_ARTICLE_PMID_RE = re.compile(r'<PMID[^>]*>(\d+)</PMID>')
+_ABSTRACT_ALL_RE = re.compile(r'<AbstractText(?:\s+Label="([^"]*)")?[^>]*>(.*?)</AbstractText>', re.DOTALL)
+_ERROR_XML_RE = re.compile(r'<ERROR>(.*?)</ERROR>', re.DOTALL)
+
+# efetch XML carries a DOCTYPE; never resolve entities or fetch the DTD
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False) if etree is not None else None
+
+# Structured-abstract Label values mapped to the section they are reported under
+_SECTION_BY_LABEL = {
+    'BACKGROUND': 'background',
+    'OBJECTIVE': 'background',
+    'PURPOSE': 'background',
+    'METHODS': 'methods',
+    'DESIGN': 'methods',
+    'MATERIALS AND METHODS': 'methods',
+    'RESULTS': 'results',
+    'FINDINGS': 'results',
+    'CONCLUSION': 'conclusions',
+    'CONCLUSIONS': 'conclusions',
+    'INTERPRETATION': 'conclusions',
+}
+
+
+def check_json_error(data: Dict):
+    """Raise if E-utilities reported an ERROR inside a JSON body it served with HTTP 200."""
+    for container in (data, data.get('esearchresult') or {}, *data.get('linksets', [])):
+        error = container.get('ERROR') or container.get('error')
+        if error:
+            raise RuntimeError(f"NCBI error: {error}")
+
+
+def check_xml_error(xml_text: str):
+    """Raise if E-utilities reported an <ERROR> element inside an XML body it served with HTTP 200."""
+    error_match = _ERROR_XML_RE.search(xml_text)
+    if error_match:
+        raise RuntimeError(f"NCBI error: {error_match.group(1).strip()}")
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ResponseCache:
+    """SQLite-backed disk cache of raw E-utilities responses keyed on endpoint and params."""
+
+    def __init__(self, path: str, expire_after: int = 30 * 86400):
+        self.expire_after = expire_after
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, fetched_at REAL)"
+        )
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        """Hash the endpoint and its params (order-independent, API key excluded)."""
+        stable = sorted((k, v) for k, v in params.items() if k != 'api_key')
+        return hashlib.blake2b(json.dumps([endpoint, stable]).encode('utf-8'), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE key = ? AND fetched_at > ?",
+                (key, time.time() - self.expire_after)
+            ).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def set(self, key: str, text: str):
+        """Store compressed response text under key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, zlib.compress(text.encode('utf-8')), time.time())
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
 
 class PubMedScraper:
     """Scrape publication data from PubMed."""
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
-
-    def __init__(self, email: str = "research@example.com"):
-        """Initialize with email for NCBI API compliance."""
-        self.email = email
+    TIMEOUT = 10
+    BATCH_SIZE = 100  # IDs per efetch/elink request (NCBI accepts up to 200)
+    MAX_WORKERS = 8
+    TOOL = "WoodsFluDashboard"
+
+    def __init__(self, email: Optional[str] = None, api_key: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None):
+        """Initialize with email (and optional API key) for NCBI API compliance.
+
+        Both fall back to the NCBI_EMAIL and NCBI_API_KEY environment variables.
+        """
+        self.email = email or os.environ.get('NCBI_EMAIL', "research@example.com")
+        self.cache = cache
+        self.api_key = api_key or os.environ.get('NCBI_API_KEY')
+
+        # NCBI allows 10 requests/sec with an API key and 3/sec without; every
+        # worker thread draws from this shared limiter
+        self.rate_limiter = RateLimiter(10 if self.api_key else 3)
+
+        # One pooled keep-alive session for every E-utilities call, with retry and
+        # backoff on throttling/server errors and gzip-compressed responses
         self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': f'{self.TOOL}/{self.email}',
+        })
+
+    def _get_text(self, endpoint: str, params: Dict) -> Tuple[str, Optional[str]]:
+        """GET an E-utilities endpoint and return the body, serving repeats from the disk cache.
+
+        Network requests go through the shared session, rate limited and with the
+        default timeout; HTTP errors are raised. NCBI also reports some transient
+        failures inside HTTP 200 bodies, so nothing is cached here: a fresh body
+        comes back with the key to store it under once the caller has parsed it
+        without error (None for cache hits or without a cache).
+        """
+        cache_key = ResponseCache.make_key(endpoint, params) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, None
+
+        # NCBI asks every request to identify the tool and a contact email; the
+        # API key lifts the rate limit. None of these change the response, so
+        # they are left out of the cache key
+        params = {**params, 'tool': self.TOOL, 'email': self.email}
+        if self.api_key:
+            params['api_key'] = self.api_key
+        self.rate_limiter.wait()
+        response = self.session.get(f"{self.BASE_URL}{endpoint}", params=params, timeout=self.TIMEOUT)
+        response.raise_for_status()
+        return response.text, cache_key
 
     def extract_pmid_from_url(self, url: str) -> Optional[str]:
         """Extract PubMed ID from various URL formats."""
@@ -38,21 +217,44 @@ class PubMedScraper:
             return None
 
         # Direct PMID in URL
-        pmid_match = re.search(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)', url)
-        if pmid_match:
-            return pmid_match.group(1)
+        pmid = self.extract_direct_pmid_from_url(url)
+        if pmid:
+            return pmid
 
         # PMC format
-        pmc_match = re.search(r'/pmc/articles/PMC(\d+)', url)
-        if pmc_match:
+        pmc_id = self.extract_pmc_id_from_url(url)
+        if pmc_id:
             # Convert PMC to PMID using API
-            return self.convert_pmc_to_pmid(f"PMC{pmc_match.group(1)}")
+            return self.convert_pmc_to_pmid(pmc_id)
+
+        return None
+
+    def extract_direct_pmid_from_url(self, url: str) -> Optional[str]:
+        """Extract a PMID from a pubmed.ncbi.nlm.nih.gov URL without any API call."""
+        # Substring checks rule out most URLs before any regex runs, and the
+        # common ".../<digits>/" form is read with plain string splitting
+        if not url or _PUBMED_HOST not in url:
+            return None
+
+        tail = url.split(_PUBMED_HOST, 1)[1].split('/', 1)[0]
+        if tail.isascii() and tail.isdigit():
+            return tail
 
+        pmid_match = _PMID_URL_RE.search(url)
+        return pmid_match.group(1) if pmid_match else None
+
+    def extract_pmc_id_from_url(self, url: str) -> Optional[str]:
+        """Extract a PMC ID (e.g. "PMC1234567") from a PMC article URL."""
+        if not url or '/pmc/articles/PMC' not in url:
+            return None
+
+        pmc_match = _PMC_URL_RE.search(url)
+        if pmc_match:
+            return f"PMC{pmc_match.group(1)}"
         return None
 
     def convert_pmc_to_pmid(self, pmc_id: str) -> Optional[str]:
         """Convert PMC ID to PMID using NCBI API."""
-        url = f"{self.BASE_URL}elink.fcgi"
         params = {
             'dbfrom': 'pmc',
             'db': 'pubmed',
@@ -61,8 +263,11 @@ class PubMedScraper:
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            data = response.json()
+            text, cache_key = self._get_text('elink.fcgi', params)
+            data = _json_loads(text)
+            check_json_error(data)
+            if cache_key:
+                self.cache.set(cache_key, text)
 
             if 'linksets' in data and len(data['linksets']) > 0:
                 linkset = data['linksets'][0]
@@ -75,26 +280,73 @@ class PubMedScraper:
 
         return None
 
+    def convert_pmc_ids_to_pmids(self, pmc_ids: List[str]) -> Dict[str, str]:
+        """Convert many PMC IDs to PMIDs, BATCH_SIZE IDs per elink request."""
+        batches = [pmc_ids[i:i + self.BATCH_SIZE] for i in range(0, len(pmc_ids), self.BATCH_SIZE)]
+
+        pmid_by_pmc = {}
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for batch_result in executor.map(self._convert_pmc_batch, batches):
+                pmid_by_pmc.update(batch_result)
+        return pmid_by_pmc
+
+    def _convert_pmc_batch(self, batch: List[str]) -> Dict[str, str]:
+        """Convert one batch of PMC IDs with a single elink request."""
+        # Repeating the id parameter makes elink return one linkset per input ID
+        params = {
+            'dbfrom': 'pmc',
+            'db': 'pubmed',
+            'id': [pmc_id.replace('PMC', '') for pmc_id in batch],
+            'retmode': 'json'
+        }
+
+        pmid_by_pmc = {}
+        try:
+            text, cache_key = self._get_text('elink.fcgi', params)
+            data = _json_loads(text)
+            check_json_error(data)
+            if cache_key:
+                self.cache.set(cache_key, text)
+
+            for linkset in data.get('linksets', []):
+                ids = linkset.get('ids', [])
+                linksetdbs = linkset.get('linksetdbs', [])
+                if ids and linksetdbs:
+                    links = linksetdbs[0].get('links', [])
+                    if links:
+                        pmid_by_pmc[f"PMC{ids[0]}"] = str(links[0])
+        except Exception as e:
+            print(f"  ⚠️  Error converting PMC batch: {e}")
+
+        return pmid_by_pmc
+
     def search_pubmed(self, title: str, author: str, year: str) -> Optional[str]:
         """Search PubMed by title, author, and year to find PMID."""
+        # Incomplete metadata only yields a useless query that still costs a
+        # request and a rate-limit slot, so skip it before touching the network
+        year = str(year).strip()
+        if not title or not author or not (year.isdigit() and len(year) == 4):
+            return None
+
         # Clean up the search query
         title_clean = title.replace('"', '').replace("'", "")
         author_last = author.split()[0] if author else ""
 
         query = f'{title_clean}[Title] AND {author_last}[Author] AND {year}[pdat]'
 
-        url = f"{self.BASE_URL}esearch.fcgi"
         params = {
             'db': 'pubmed',
             'term': query,
             'retmode': 'json',
-            'retmax': 1,
-            'email': self.email
+            'retmax': 1
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            data = response.json()
+            text, cache_key = self._get_text('esearch.fcgi', params)
+            data = _json_loads(text)
+            check_json_error(data)
+            if cache_key:
+                self.cache.set(cache_key, text)
 
             if 'esearchresult' in data and 'idlist' in data['esearchresult']:
                 ids = data['esearchresult']['idlist']
@@ -107,27 +359,107 @@ class PubMedScraper:
 
     def fetch_abstract(self, pmid: str) -> Optional[Dict]:
         """Fetch abstract and metadata from PubMed."""
-        url = f"{self.BASE_URL}efetch.fcgi"
         params = {
             'db': 'pubmed',
             'id': pmid,
             'rettype': 'abstract',
-            'retmode': 'xml',
-            'email': self.email
+            'retmode': 'xml'
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
-
-            if response.status_code == 200:
-                return self.parse_abstract_xml(response.text)
+            text, cache_key = self._get_text('efetch.fcgi', params)
+            check_xml_error(text)
+            abstract_data = self.parse_abstract_xml(text)
+            if cache_key:
+                self.cache.set(cache_key, text)
+            return abstract_data
         except Exception as e:
             print(f"  ⚠️  Error fetching abstract: {e}")
 
         return None
 
+    def fetch_abstracts(self, pmids: List[str]) -> Dict[str, Dict]:
+        """Fetch abstracts for many PMIDs, BATCH_SIZE IDs per efetch request."""
+        batches = [pmids[i:i + self.BATCH_SIZE] for i in range(0, len(pmids), self.BATCH_SIZE)]
+
+        abstracts = {}
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for batch_result in executor.map(self._fetch_abstract_batch, batches):
+                abstracts.update(batch_result)
+        return abstracts
+
+    def _fetch_abstract_batch(self, batch: List[str]) -> Dict[str, Dict]:
+        """Fetch one batch of abstracts with a single efetch request."""
+        params = {
+            'db': 'pubmed',
+            'id': ','.join(batch),
+            'rettype': 'abstract',
+            'retmode': 'xml'
+        }
+
+        try:
+            text, cache_key = self._get_text('efetch.fcgi', params)
+            check_xml_error(text)
+            articles = self.parse_articles_xml(text)
+            if cache_key:
+                self.cache.set(cache_key, text)
+            return articles
+        except Exception as e:
+            print(f"  ⚠️  Error fetching abstracts: {e}")
+
+        return {}
+
+    def parse_articles_xml(self, xml_text: str) -> Dict[str, Dict]:
+        """Parse a multi-article efetch response into {pmid: abstract_data}."""
+        if etree is not None:
+            try:
+                root = etree.fromstring(xml_text.encode('utf-8'), parser=_XML_PARSER)
+                return {
+                    article.findtext('MedlineCitation/PMID'): self._parse_abstract_element(article)
+                    for article in root.iter('PubmedArticle')
+                }
+            except etree.XMLSyntaxError:
+                pass
+
+        articles = {}
+        for article_match in _ARTICLE_RE.finditer(xml_text):
+            article_xml = article_match.group(0)
+            pmid_match = _ARTICLE_PMID_RE.search(article_xml)
+            if pmid_match:
+                articles[pmid_match.group(1)] = self._parse_abstract_regex(article_xml)
+        return articles
+
     def parse_abstract_xml(self, xml_text: str) -> Dict:
         """Parse PubMed XML to extract structured abstract."""
+        if etree is not None:
+            try:
+                root = etree.fromstring(xml_text.encode('utf-8'), parser=_XML_PARSER)
+                return self._parse_abstract_element(root)
+            except etree.XMLSyntaxError:
+                pass
+        return self._parse_abstract_regex(xml_text)
+
+    def _parse_abstract_element(self, element) -> Dict:
+        """Parse abstract sections under an lxml element, reading each AbstractText's Label and text."""
+        return self._bucket_sections(
+            (el.get('Label'), ''.join(el.itertext()).strip())
+            for el in element.iter('AbstractText')
+        )
+
+    def _parse_abstract_regex(self, xml_text: str) -> Dict:
+        """Parse abstract sections with regex when lxml is unavailable or the XML is malformed."""
+        # Remove XML tags from each AbstractText body
+        return self._bucket_sections(
+            (label, _XML_TAG_RE.sub('', body).strip())
+            for label, body in _ABSTRACT_ALL_RE.findall(xml_text)
+        )
+
+    def _bucket_sections(self, sections) -> Dict:
+        """Sort (label, text) pairs into abstract sections with a dict lookup on the Label.
+
+        Texts sharing a section (e.g. BACKGROUND and OBJECTIVE) are joined in
+        document order; every text also goes into the full abstract.
+        """
         abstract_data = {
             'background': '',
             'methods': '',
@@ -136,52 +468,41 @@ class PubMedScraper:
             'full_abstract': ''
         }
 
-        # Extract structured abstract sections
-        patterns = {
-            'background': r'<AbstractText Label="(?:BACKGROUND|OBJECTIVE|PURPOSE)"[^>]*>(.*?)</AbstractText>',
-            'methods': r'<AbstractText Label="(?:METHODS|DESIGN|MATERIALS AND METHODS)"[^>]*>(.*?)</AbstractText>',
-            'results': r'<AbstractText Label="(?:RESULTS|FINDINGS)"[^>]*>(.*?)</AbstractText>',
-            'conclusions': r'<AbstractText Label="(?:CONCLUSIONS?|INTERPRETATION)"[^>]*>(.*?)</AbstractText>',
-        }
+        all_texts = []
+        for label, text in sections:
+            if not text:
+                continue
+            all_texts.append(text)
 
-        for key, pattern in patterns.items():
-            match = re.search(pattern, xml_text, re.IGNORECASE | re.DOTALL)
-            if match:
-                text = match.group(1)
-                # Remove XML tags
-                text = re.sub(r'<[^>]+>', '', text)
-                text = text.strip()
-                abstract_data[key] = text
-
-        # Get full abstract if structured sections not available
-        all_abstract = re.findall(r'<AbstractText[^>]*>(.*?)</AbstractText>', xml_text, re.DOTALL)
-        if all_abstract:
-            full_text = ' '.join(all_abstract)
-            full_text = re.sub(r'<[^>]+>', '', full_text)
-            abstract_data['full_abstract'] = full_text.strip()
+            key = _SECTION_BY_LABEL.get(label.upper()) if label else None
+            if key:
+                abstract_data[key] = f"{abstract_data[key]} {text}" if abstract_data[key] else text
 
+        abstract_data['full_abstract'] = ' '.join(all_texts)
         return abstract_data
 
     def summarize_findings(self, abstract_data: Dict) -> str:
         """Create 1-3 sentence summary of study findings."""
         summary_parts = []
 
-        # Prioritize results and conclusions
+        # Prioritize results and conclusions. Splits stop after the sentences that
+        # are used, and long sections are capped first - the summary itself is
+        # limited to 500 characters, so nothing past the cap can reach it
         if abstract_data['results']:
             # Get first 2 sentences of results
-            results = abstract_data['results']
-            sentences = re.split(r'(?<=[.!?])\s+', results)[:2]
+            results = abstract_data['results'][:SECTION_SCAN_LIMIT]
+            sentences = _SENT_SPLIT_RE.split(results, maxsplit=2)[:2]
             summary_parts.extend(sentences)
 
         if abstract_data['conclusions'] and len(summary_parts) < 3:
             # Add conclusion if we need more
-            conclusions = abstract_data['conclusions']
-            sentences = re.split(r'(?<=[.!?])\s+', conclusions)[:1]
+            conclusions = abstract_data['conclusions'][:SECTION_SCAN_LIMIT]
+            sentences = _SENT_SPLIT_RE.split(conclusions, maxsplit=1)[:1]
             summary_parts.extend(sentences)
 
-        # Fallback to full abstract
+        # Fallback to full abstract (not capped: the skipped first sentence may be long)
         if not summary_parts and abstract_data['full_abstract']:
-            sentences = re.split(r'(?<=[.!?])\s+', abstract_data['full_abstract'])
+            sentences = _SENT_SPLIT_RE.split(abstract_data['full_abstract'], maxsplit=4)
             # Skip first sentence (usually background), take next 2-3
             summary_parts = sentences[1:4] if len(sentences) > 1 else sentences[:3]
 
@@ -194,8 +515,12 @@ class PubMedScraper:
         return summary
 
 
-def process_publications(studies_json_path: str) -> pd.DataFrame:
-    """Process all publications and fetch PubMed abstracts."""
+def process_publications(studies_json_path: str, refresh: bool = False) -> pd.DataFrame:
+    """Process all publications and fetch PubMed abstracts.
+
+    Responses are cached in CACHE_PATH so re-runs skip the network; pass
+    refresh=True to discard the cache first.
+    """
 
     print("="*70)
     print("PubMed Abstract Scraper")
@@ -205,85 +530,110 @@ def process_publications(studies_json_path: str) -> pd.DataFrame:
     with open(studies_json_path, 'r') as f:
         studies = json.load(f)
 
-    scraper = PubMedScraper()
+    cache = ResponseCache(CACHE_PATH)
+    if refresh:
+        cache.clear()
+        print("  ✓ Cleared PubMed response cache")
+    scraper = PubMedScraper(cache=cache)
 
-    results = []
-    total_pubs = sum(len(study['publications']) for study in studies)
-    processed = 0
+    pubs = [(study, pub) for study in studies for pub in study['publications']]
+    total_pubs = len(pubs)
 
     print(f"\nProcessing {total_pubs} publications...")
 
+    # Pass 1: resolve a PMID for every publication. PubMed URLs are read directly,
+    # PMC URLs are converted in batched elink calls, the rest are searched by metadata
+    pmc_ids = {}
+    for i, (study, pub) in enumerate(pubs):
+        url = pub.get('url', '')
+        if url and not scraper.extract_direct_pmid_from_url(url):
+            pmc_id = scraper.extract_pmc_id_from_url(url)
+            if pmc_id:
+                pmc_ids[i] = pmc_id
+
+    pmid_by_pmc = {}
+    if pmc_ids:
+        print(f"\n→ Converting {len(pmc_ids)} PMC IDs to PMIDs...")
+        pmid_by_pmc = scraper.convert_pmc_ids_to_pmids(sorted(set(pmc_ids.values())))
+
+    url_pmids = []
+    for i, (study, pub) in enumerate(pubs):
+        url_pmids.append(scraper.extract_direct_pmid_from_url(pub.get('url'))
+                         or pmid_by_pmc.get(pmc_ids.get(i)))
+
+    # Metadata searches are independent, so they run on a thread pool; the
+    # scraper's rate limiter keeps the combined request rate within NCBI's limit
+    to_search = [i for i, pmid in enumerate(url_pmids) if not pmid]
+    if to_search:
+        print(f"\n→ Searching PubMed by title/author for {len(to_search)} publications...")
+    with ThreadPoolExecutor(max_workers=scraper.MAX_WORKERS) as executor:
+        searched = dict(zip(to_search, executor.map(
+            lambda i: scraper.search_pubmed(
+                pubs[i][1].get('title', ''),
+                pubs[i][1].get('first_author', ''),
+                pubs[i][1].get('year', '')
+            ),
+            to_search
+        )))
+
+    # Progress lines are buffered and written once per study rather than with
+    # a print (and terminal flush) per line
+    pmids = []
+    i = 0
     for study in studies:
-        study_id = study['id']
-        study_title = study['title']
-        study_strain = study['strain']
-
+        log_lines = []
         for pub in study['publications']:
-            processed += 1
-            print(f"\n[{processed}/{total_pubs}] Processing: {pub['first_author']} et al. ({pub['year']})")
+            log_lines.append(f"\n[{i + 1}/{total_pubs}] Processing: {pub['first_author']} et al. ({pub['year']})")
 
-            # Try to get PMID
-            pmid = None
-
-            # First, try extracting from URL
-            if pub.get('url'):
-                pmid = scraper.extract_pmid_from_url(pub['url'])
-                if pmid:
-                    print(f"  ✓ Found PMID from URL: {pmid}")
-
-            # If no PMID from URL, search by metadata
-            if not pmid:
-                print(f"  → Searching PubMed by title/author...")
-                pmid = scraper.search_pubmed(
-                    pub.get('title', ''),
-                    pub.get('first_author', ''),
-                    pub.get('year', '')
-                )
+            pmid = url_pmids[i]
+            if pmid:
+                log_lines.append(f"  ✓ Found PMID from URL: {pmid}")
+            else:
+                pmid = searched[i]
                 if pmid:
-                    print(f"  ✓ Found PMID: {pmid}")
-
-            if not pmid:
-                print(f"  ✗ Could not find PMID")
-                results.append({
-                    'study_id': study_id,
-                    'study_title': study_title,
-                    'study_strain': study_strain,
-                    'first_author': pub.get('first_author', ''),
-                    'title': pub.get('title', ''),
-                    'journal': pub.get('journal', ''),
-                    'year': pub.get('year', ''),
-                    'url': pub.get('url', ''),
-                    'pmid': None,
-                    'findings_summary': ''
-                })
-                continue
+                    log_lines.append(f"  ✓ Found PMID: {pmid}")
+                else:
+                    log_lines.append(f"  ✗ Could not find PMID")
 
-            # Fetch abstract
-            print(f"  → Fetching abstract...")
-            time.sleep(0.4)  # Be nice to NCBI servers
+            pmids.append(pmid)
+            i += 1
 
-            abstract_data = scraper.fetch_abstract(pmid)
+        if log_lines:
+            print('\n'.join(log_lines))
 
+    # Pass 2: fetch every abstract in batched efetch calls
+    unique_pmids = list(dict.fromkeys(pmid for pmid in pmids if pmid))
+    n_batches = -(-len(unique_pmids) // scraper.BATCH_SIZE)
+    print(f"\n→ Fetching {len(unique_pmids)} abstracts in {n_batches} batch(es)...")
+    abstracts = scraper.fetch_abstracts(unique_pmids)
+    print(f"  ✓ Retrieved {len(abstracts)} abstracts")
+
+    results = []
+    missing_abstracts = []
+    for (study, pub), pmid in zip(pubs, pmids):
+        findings = ""
+        if pmid:
+            abstract_data = abstracts.get(pmid)
             if not abstract_data:
-                print(f"  ✗ Could not fetch abstract")
-                findings = ""
+                missing_abstracts.append(f"  ✗ Could not fetch abstract for PMID {pmid}")
             else:
-                print(f"  ✓ Abstract retrieved")
                 findings = scraper.summarize_findings(abstract_data)
-                print(f"  ✓ Summary: {findings[:100]}...")
-
-            results.append({
-                'study_id': study_id,
-                'study_title': study_title,
-                'study_strain': study_strain,
-                'first_author': pub.get('first_author', ''),
-                'title': pub.get('title', ''),
-                'journal': pub.get('journal', ''),
-                'year': pub.get('year', ''),
-                'url': pub.get('url', ''),
-                'pmid': pmid,
-                'findings_summary': findings
-            })
+
+        results.append({
+            'study_id': study['id'],
+            'study_title': study['title'],
+            'study_strain': study['strain'],
+            'first_author': pub.get('first_author', ''),
+            'title': pub.get('title', ''),
+            'journal': pub.get('journal', ''),
+            'year': pub.get('year', ''),
+            'url': pub.get('url', ''),
+            'pmid': pmid,
+            'findings_summary': findings
+        })
+
+    if missing_abstracts:
+        print('\n'.join(missing_abstracts))
 
     return pd.DataFrame(results)
 
@@ -291,8 +641,8 @@ def process_publications(studies_json_path: str) -> pd.DataFrame:
 def main():
     """Main execution."""
 
-    # Process publications
-    df = process_publications("output/studies.json")
+    # Process publications (--refresh ignores cached PubMed responses)
+    df = process_publications("output/studies.json", refresh='--refresh' in sys.argv[1:])
 
     print(f"\n{'='*70}")
     print("Processing Complete")
@@ -300,7 +650,7 @@ def main():
 
     # Count successes
     found_pmid = df['pmid'].notna().sum()
-    found_summary = df['findings_summary'].str.len().gt(0).sum()
+    found_summary = df['findings_summary'].fillna('').ne('').sum()
 
     print(f"\nResults:")
     print(f"  • Total publications: {len(df)}")
@@ -6,10 +6,48 @@ to establish complete data provenance chains
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import io
 import json
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from dataclasses import dataclass
+
+from json_io import write_json, json_line
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+def write_csv(df, path, engine='pandas'):
+    """Write df as CSV; the polars engine uses pyarrow's multithreaded writer"""
+    if engine == 'polars':
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    else:
+        df.to_csv(path, index=False)
+
+
+# Inventory columns read by the linkers; the harmonized parquet carries many more
+INVENTORY_COLS = ['study_code', 'sample_barcode_id', 'participant_id', 'sample_type',
+                  'is_available', 'is_transferred', 'timepoint_normalized']
+
+# Publication fields used by the linkers, with the default for a missing key
+PUBLICATION_FIELDS = {
+    'title': 'Unknown',
+    'pmid': 'N/A',
+    'year': 'Unknown',
+    'study_name': 'Unknown',
+    'biobank_study_code': 'Unknown',
+    'journal': 'Unknown'
+}
 
 def load_all_data():
     """Load harmonized inventory, citations, and assay tracking"""
@@ -19,7 +57,11 @@ def load_all_data():
 
     # Load harmonized inventory
     print("\n1. Loading harmonized sample inventory...")
-    inventory_df = pd.read_parquet('data/processed/combined_inventory_harmonized.parquet')
+    inventory_df = pd.read_parquet('data/processed/combined_inventory_harmonized.parquet',
+                                   columns=INVENTORY_COLS, engine='pyarrow', dtype_backend='pyarrow')
+    # Low-cardinality keys are grouped and compared in every linkage step
+    inventory_df['study_code'] = inventory_df['study_code'].astype('category')
+    inventory_df['sample_type'] = inventory_df['sample_type'].astype('category')
     print(f"   ✓ Loaded {len(inventory_df):,} samples from {inventory_df['study_code'].nunique()} studies")
 
     # Load citations
@@ -27,47 +69,98 @@ def load_all_data():
     with open('data/publications/citations.json', 'r') as f:
         citations_data = json.load(f)
     publications = citations_data['publications']
-    print(f"   ✓ Loaded {len(publications)} publications")
+
+    # One table of the used fields (object dtype keeps values as loaded)
+    pubs_df = pd.DataFrame(
+        [{field: pub.get(field, default) for field, default in PUBLICATION_FIELDS.items()}
+         for pub in publications],
+        columns=list(PUBLICATION_FIELDS), dtype=object
+    )
+    pubs_df['title_100'] = pubs_df['title'].str.slice(0, 100)
+    pubs_df['title_80'] = pubs_df['title'].str.slice(0, 80)
+
+    # Provenance entries of each study's publications, for the per-study linkers
+    pubs_by_study = defaultdict(list)
+    for study_code, title, year, pmid, journal in zip(pubs_df['biobank_study_code'], pubs_df['title_80'],
+                                                      pubs_df['year'], pubs_df['pmid'], pubs_df['journal']):
+        pubs_by_study[study_code].append({'title': title, 'year': year, 'pmid': pmid, 'journal': journal})
+    print(f"   ✓ Loaded {len(pubs_df)} publications")
 
     # Load assay tracking
     print("\n3. Loading assay tracking data...")
     assay_tracking_df = pd.read_csv('data/processed/assay_tracking_table.csv')
+    assay_tracking_df['biobank_study_code'] = assay_tracking_df['biobank_study_code'].astype('category')
     print(f"   ✓ Loaded {len(assay_tracking_df)} assay records")
 
-    with open('data/processed/assay_data_complete.json', 'r') as f:
-        assay_data = json.load(f)
+    return inventory_df, pubs_df, pubs_by_study, assay_tracking_df
 
-    return inventory_df, publications, assay_tracking_df, assay_data
 
+def list_sample_types_by_study(inventory_df, limit=10):
+    """First `limit` distinct sample types of each study, in inventory order"""
+    # One drop_duplicates over the (study, type) pairs instead of a unique()
+    # per study; what remains is at most studies x sample types rows
+    pairs = inventory_df[['study_code', 'sample_type']].dropna().drop_duplicates()
 
-def link_publications_to_studies(publications, inventory_df):
-    """Link each publication to the studies it used"""
-    print("\n" + "="*80)
-    print("LINKING: Publications to Studies")
-    print("="*80)
+    sample_types_by_study = defaultdict(list)
+    for study_code, sample_type in zip(pairs['study_code'], pairs['sample_type']):
+        study_types = sample_types_by_study[study_code]
+        if len(study_types) < limit:
+            study_types.append(sample_type)
 
-    pub_to_study_links = []
+    return dict(sample_types_by_study)
 
-    for pub in publications:
-        study_code = pub.get('biobank_study_code', 'Unknown')
 
-        if study_code != 'Unknown':
-            # Get sample info for this study
-            study_samples = inventory_df[inventory_df['study_code'] == study_code]
+@dataclass(slots=True)
+class StudySummary:
+    """Inventory totals of one study, shared by every linker"""
+    n_samples: int
+    n_participants: int
+    n_sample_types: int
+    n_available: int
+    n_transferred: int
+    sample_types: list[str]
 
-            link = {
-                'publication_id': pub.get('title', 'Unknown')[:100],
-                'pmid': pub.get('pmid', 'N/A'),
-                'year': pub.get('year', 'Unknown'),
-                'study_code': study_code,
-                'study_name': pub.get('study_name', 'Unknown'),
-                'total_samples_in_study': len(study_samples),
-                'participants_in_study': study_samples['participant_id'].nunique() if len(study_samples) > 0 else 0,
-                'sample_types_available': ', '.join(study_samples['sample_type'].dropna().unique()[:10]) if len(study_samples) > 0 else 'N/A'
-            }
-            pub_to_study_links.append(link)
 
-    pub_study_df = pd.DataFrame(pub_to_study_links)
+def build_study_summary(inventory_df):
+    """Summarize every study in a single groupby pass over the inventory"""
+    counts = inventory_df.groupby('study_code', sort=False, observed=True).agg(
+        n_samples=('sample_barcode_id', 'size'),
+        n_participants=('participant_id', 'nunique'),
+        n_sample_types=('sample_type', 'nunique'),
+        # The flags are bool columns, so a sum counts the True values
+        n_available=('is_available', 'sum'),
+        n_transferred=('is_transferred', 'sum')
+    )
+    sample_types_by_study = list_sample_types_by_study(inventory_df)
+
+    return {
+        study_code: StudySummary(*stats, sample_types=sample_types_by_study.get(study_code, []))
+        for study_code, *stats in counts.itertuples(name=None)
+    }
+
+
+def link_publications_to_studies(pubs_df, study_summary):
+    """Link each publication to the studies it used"""
+    print("\n" + "="*80)
+    print("LINKING: Publications to Studies")
+    print("="*80)
+
+    linked = pubs_df[pubs_df['biobank_study_code'] != 'Unknown']
+    study_codes = linked['biobank_study_code'].tolist()
+
+    # Get sample info for each publication's study
+    summaries = [study_summary.get(study_code) for study_code in study_codes]
+
+    pub_study_df = pd.DataFrame({
+        'publication_id': linked['title_100'].tolist(),
+        'pmid': linked['pmid'].tolist(),
+        'year': linked['year'].tolist(),
+        'study_code': study_codes,
+        'study_name': linked['study_name'].tolist(),
+        'total_samples_in_study': [summary.n_samples if summary else 0 for summary in summaries],
+        'participants_in_study': [summary.n_participants if summary else 0 for summary in summaries],
+        'sample_types_available': [', '.join(summary.sample_types) if summary else 'N/A' for summary in summaries]
+    }, copy=False)
     print(f"\n✓ Created {len(pub_study_df)} publication-to-study links")
 
     if len(pub_study_df) > 0:
@@ -79,51 +172,38 @@ def link_publications_to_studies(publications, inventory_df):
     return pub_study_df
 
 
-def link_publications_to_assays(publications, assay_tracking_df):
+def link_publications_to_assays(pubs_df, assay_tracking_df):
     """Link publications to specific assays that generated data"""
     print("\n" + "="*80)
     print("LINKING: Publications to Assays")
     print("="*80)
 
-    pub_to_assay_links = []
-
-    for pub in publications:
-        study_code = pub.get('biobank_study_code', 'Unknown')
-
-        if study_code != 'Unknown':
-            # Find assays performed for this study
-            study_assays = assay_tracking_df[assay_tracking_df['biobank_study_code'] == study_code]
-
-            if len(study_assays) > 0:
-                for _, assay in study_assays.iterrows():
-                    link = {
-                        'publication_title': pub.get('title', 'Unknown')[:100],
-                        'pmid': pub.get('pmid', 'N/A'),
-                        'year': pub.get('year', 'Unknown'),
-                        'study_code': study_code,
-                        'assay_type': assay['Assay'],
-                        'assay_samples': assay['Samples'],
-                        'subject_range': assay['Subject ID ranges'],
-                        'timepoints': assay['Timepoint(s)'],
-                        'data_key': assay['Keys']
-                    }
-                    pub_to_assay_links.append(link)
-            else:
-                # No assays found for this study - note it
-                link = {
-                    'publication_title': pub.get('title', 'Unknown')[:100],
-                    'pmid': pub.get('pmid', 'N/A'),
-                    'year': pub.get('year', 'Unknown'),
-                    'study_code': study_code,
-                    'assay_type': 'No assays tracked',
-                    'assay_samples': 0,
-                    'subject_range': 'N/A',
-                    'timepoints': 'N/A',
-                    'data_key': 'N/A'
-                }
-                pub_to_assay_links.append(link)
-
-    pub_assay_df = pd.DataFrame(pub_to_assay_links)
+    # Join publications to the assays of their study in one hash merge
+    pubs_df = pubs_df.loc[pubs_df['biobank_study_code'] != 'Unknown',
+                          ['title_100', 'pmid', 'year', 'biobank_study_code']].rename(columns={
+        'title_100': 'publication_title',
+        'biobank_study_code': 'study_code'
+    })
+
+    assays_df = assay_tracking_df[['biobank_study_code', 'Assay', 'Samples', 'Subject ID ranges',
+                                   'Timepoint(s)', 'Keys']].rename(columns={
+        'biobank_study_code': 'study_code',
+        'Assay': 'assay_type',
+        'Samples': 'assay_samples',
+        'Subject ID ranges': 'subject_range',
+        'Timepoint(s)': 'timepoints',
+        'Keys': 'data_key'
+    })
+    pub_assay_df = pubs_df.merge(assays_df, on='study_code', how='left', indicator=True)
+
+    # No assays found for a publication's study - note it
+    no_assays = pub_assay_df.pop('_merge') == 'left_only'
+    pub_assay_df.loc[no_assays, ['assay_type', 'assay_samples', 'subject_range', 'timepoints', 'data_key']] = \
+        ['No assays tracked', 0, 'N/A', 'N/A', 'N/A']
+    if no_assays.any() and pd.api.types.is_integer_dtype(assays_df['assay_samples']):
+        pub_assay_df['assay_samples'] = pub_assay_df['assay_samples'].astype(assays_df['assay_samples'].dtype)
+    pub_assay_df = pub_assay_df.reset_index(drop=True)
+
     print(f"\n✓ Created {len(pub_assay_df)} publication-to-assay links")
 
     # Summary
@@ -137,159 +217,232 @@ def link_publications_to_assays(publications, assay_tracking_df):
     return pub_assay_df
 
 
-def create_sample_to_publication_map(inventory_df, publications):
+def map_samples_polars(sample_table, pubs_df):
+    """Join publications onto their study's samples with a polars hash join"""
+    samples = pl.from_pandas(sample_table).with_row_index('sample_row').with_columns(
+        pl.col('study_code').cast(pl.String).alias('join_study_code')
+    )
+    linked_pubs = pubs_df.loc[pubs_df['biobank_study_code'] != 'Unknown',
+                              ['biobank_study_code', 'title_80', 'year', 'pmid']]
+    pubs = pl.from_pandas(linked_pubs).with_row_index('pub_row').rename({
+        'biobank_study_code': 'join_study_code',
+        'title_80': 'publication_title',
+        'year': 'publication_year',
+        'pmid': 'publication_pmid'
+    })
+
+    # Keep the pandas engine's order: publications as listed, then inventory order
+    joined = pubs.join(samples, on='join_study_code', how='inner').sort(['pub_row', 'sample_row'])
+    return joined.select(
+        list(sample_table.columns) + ['publication_title', 'publication_year', 'publication_pmid']
+    ).to_pandas()
+
+
+def create_sample_to_publication_map(inventory_df, pubs_df, engine='pandas'):
     """Map which samples could have been used in which publications"""
     print("\n" + "="*80)
     print("MAPPING: Samples to Publications")
     print("="*80)
 
-    sample_pub_map = []
-
-    for pub in publications:
-        study_code = pub.get('biobank_study_code', 'Unknown')
-
-        if study_code != 'Unknown':
-            # Get all samples from this study
-            study_samples = inventory_df[inventory_df['study_code'] == study_code]
-
-            for _, sample in study_samples.iterrows():
-                mapping = {
-                    'sample_barcode_id': sample['sample_barcode_id'],
-                    'participant_id': sample['participant_id'],
-                    'study_code': study_code,
-                    'timepoint_normalized': sample['timepoint_normalized'],
-                    'sample_type': sample['sample_type'],
-                    'is_available': sample['is_available'],
-                    'is_transferred': sample['is_transferred'],
-                    'publication_title': pub.get('title', 'Unknown')[:80],
-                    'publication_year': pub.get('year', 'Unknown'),
-                    'publication_pmid': pub.get('pmid', 'N/A')
-                }
-                sample_pub_map.append(mapping)
-
-    sample_pub_df = pd.DataFrame(sample_pub_map)
+    sample_cols = ['sample_barcode_id', 'participant_id', 'study_code', 'timepoint_normalized',
+                   'sample_type', 'is_available', 'is_transferred']
+    # Narrow to the mapped columns once so each publication takes a single
+    # copy of just those columns for its study's rows
+    sample_table = inventory_df[sample_cols]
+
+    if engine == 'polars':
+        sample_pub_df = map_samples_polars(sample_table, pubs_df)
+        print(f"\n✓ Created {len(sample_pub_df):,} sample-to-publication potential linkages")
+        return sample_pub_df
+
+    # Row positions of each study's samples, computed once instead of a full
+    # boolean scan of the inventory per publication
+    idx_by_study = inventory_df.groupby('study_code', sort=False, observed=True).indices
+
+    parts = []
+
+    for study_code, title, year, pmid in zip(pubs_df['biobank_study_code'], pubs_df['title_80'],
+                                             pubs_df['year'], pubs_df['pmid']):
+        if study_code != 'Unknown' and study_code in idx_by_study:
+            # Get all samples from this study and broadcast the publication fields
+            study_samples = sample_table.take(idx_by_study[study_code])
+            study_samples['publication_title'] = title
+            study_samples['publication_year'] = year
+            study_samples['publication_pmid'] = pmid
+            parts.append(study_samples)
+
+    if parts:
+        sample_pub_df = pd.concat(parts, ignore_index=True)
+    else:
+        sample_pub_df = pd.DataFrame(columns=sample_cols + ['publication_title', 'publication_year', 'publication_pmid'])
     print(f"\n✓ Created {len(sample_pub_df):,} sample-to-publication potential linkages")
 
     return sample_pub_df
 
 
-def identify_multi_use_samples(sample_pub_df):
+def count_multi_use_polars(sample_pub_df):
+    """Per-sample publication counts and titles with a polars group_by"""
+    samples = pl.from_pandas(sample_pub_df[['sample_barcode_id', 'publication_pmid', 'publication_title',
+                                            'study_code', 'sample_type', 'is_transferred']])
+    multi_use = samples.filter(pl.col('sample_barcode_id').is_not_null()).group_by('sample_barcode_id').agg(
+        pl.col('publication_pmid').drop_nulls().n_unique().cast(pl.Int64).alias('num_publications'),
+        pl.col('publication_title').unique(maintain_order=True).head(3).str.join(' | ').alias('publication_titles'),
+        pl.col('study_code').drop_nulls().first(),
+        pl.col('sample_type').drop_nulls().first(),
+        pl.col('is_transferred').drop_nulls().first()
+    ).filter(pl.col('num_publications') > 1).sort('sample_barcode_id')
+    return multi_use.to_pandas()
+
+
+def identify_multi_use_samples(sample_pub_df, engine='pandas'):
     """Identify samples that appear in multiple publications"""
     print("\n" + "="*80)
     print("IDENTIFYING: Multi-Use Samples")
     print("="*80)
 
+    if engine == 'polars':
+        multi_use = count_multi_use_polars(sample_pub_df)
+        multi_use = multi_use.sort_values('num_publications', ascending=False)
+        report_multi_use(multi_use)
+        return multi_use
+
     # Count publications per sample
-    sample_pub_counts = sample_pub_df.groupby('sample_barcode_id').agg({
-        'publication_pmid': 'nunique',
-        'publication_title': lambda x: ' | '.join(x.unique()[:3]),
-        'study_code': 'first',
-        'sample_type': 'first',
-        'is_transferred': 'first'
-    }).reset_index()
-
-    sample_pub_counts.columns = ['sample_barcode_id', 'num_publications', 'publication_titles',
-                                   'study_code', 'sample_type', 'is_transferred']
-
-    # Filter to samples in multiple publications
-    multi_use = sample_pub_counts[sample_pub_counts['num_publications'] > 1].copy()
+    num_publications = sample_pub_df.groupby('sample_barcode_id', sort=False)['publication_pmid'].nunique()
+
+    # Filter to samples in multiple publications; titles and sample fields are
+    # only gathered for this subset. Ordering by sample id here, rather than
+    # sorting every group key, keeps the output order independent of the inventory's
+    num_publications = num_publications[num_publications > 1].sort_index()
+    multi_rows = sample_pub_df[sample_pub_df['sample_barcode_id'].isin(num_publications.index)]
+
+    publication_titles = (
+        multi_rows.drop_duplicates(['sample_barcode_id', 'publication_title'])
+        .groupby('sample_barcode_id', sort=False).head(3)
+        .groupby('sample_barcode_id', sort=False)['publication_title'].agg(' | '.join)
+    )
+    sample_fields = multi_rows.groupby('sample_barcode_id', sort=False)[['study_code', 'sample_type', 'is_transferred']].first()
+
+    multi_use = pd.concat([
+        num_publications.rename('num_publications'),
+        publication_titles.rename('publication_titles'),
+        sample_fields
+    ], axis=1).rename_axis('sample_barcode_id').reset_index()
     multi_use = multi_use.sort_values('num_publications', ascending=False)
+    report_multi_use(multi_use)
+
+    return multi_use
+
 
+def report_multi_use(multi_use):
+    """Print the multi-use sample summary"""
     print(f"\n✓ Found {len(multi_use):,} samples potentially used in multiple publications")
 
     if len(multi_use) > 0:
         print(f"\nTop multi-use samples:")
         print(multi_use.head(10)[['sample_barcode_id', 'num_publications', 'study_code', 'sample_type']].to_string(index=False))
 
-    return multi_use
-
-
-def create_provenance_chains(inventory_df, assay_tracking_df, publications):
-    """Create complete provenance chains: Collection → Assay → Publication"""
-    print("\n" + "="*80)
-    print("BUILDING: Data Provenance Chains")
-    print("="*80)
 
-    provenance_chains = []
+def iter_provenance_chains(assay_tracking_df, pubs_by_study, study_summary):
+    """Yield one provenance chain per tracked assay: Collection → Assay → Publication"""
+    # Collection summary of each study, built once rather than per assay
+    collection_by_study = {
+        study_code: {
+            'total_samples_collected': summary.n_samples,
+            'participants': summary.n_participants,
+            'sample_types': summary.sample_types,
+            'date_range': f"{study_code}"
+        }
+        for study_code, summary in study_summary.items()
+    }
+    no_collection = {'total_samples_collected': 0, 'participants': 0, 'sample_types': [], 'date_range': 'Unknown'}
+    assay_cols = ['Assay', 'Samples', 'Subject ID ranges', 'Timepoint(s)', 'Keys']
 
     # For each study with assays
-    for study_code in assay_tracking_df['biobank_study_code'].unique():
-        study_assays = assay_tracking_df[assay_tracking_df['biobank_study_code'] == study_code]
-        study_samples = inventory_df[inventory_df['study_code'] == study_code]
-        study_pubs = [p for p in publications if p.get('biobank_study_code') == study_code]
+    for study_code, study_assays in assay_tracking_df.groupby('biobank_study_code', sort=False, observed=True):
+        collection = collection_by_study.get(study_code, no_collection)
+        study_pubs = pubs_by_study.get(study_code, [])
 
-        for _, assay in study_assays.iterrows():
-            chain = {
+        for assay_type, samples, subjects, timepoints, data_key in study_assays[assay_cols].itertuples(index=False, name=None):
+            yield {
                 'study_code': study_code,
-                'collection': {
-                    'total_samples_collected': len(study_samples),
-                    'participants': study_samples['participant_id'].nunique() if len(study_samples) > 0 else 0,
-                    'sample_types': list(study_samples['sample_type'].dropna().unique()[:10]) if len(study_samples) > 0 else [],
-                    'date_range': f"{study_samples['study_code'].iloc[0]}" if len(study_samples) > 0 else 'Unknown'
-                },
+                'collection': collection,
                 'assay': {
-                    'assay_type': assay['Assay'],
-                    'samples_assayed': int(assay['Samples']) if pd.notna(assay['Samples']) else 0,
-                    'subjects': assay['Subject ID ranges'],
-                    'timepoints': assay['Timepoint(s)'],
-                    'data_key': assay['Keys']
+                    'assay_type': assay_type,
+                    'samples_assayed': int(samples) if pd.notna(samples) else 0,
+                    'subjects': subjects,
+                    'timepoints': timepoints,
+                    'data_key': data_key
                 },
-                'publications': [
-                    {
-                        'title': p.get('title', 'Unknown')[:80],
-                        'year': p.get('year', 'Unknown'),
-                        'pmid': p.get('pmid', 'N/A'),
-                        'journal': p.get('journal', 'Unknown')
-                    }
-                    for p in study_pubs
-                ],
+                'publications': study_pubs,
                 'num_publications': len(study_pubs)
             }
-            provenance_chains.append(chain)
 
-    print(f"\n✓ Created {len(provenance_chains)} complete provenance chains")
 
-    # Summary statistics
-    total_assays = len(provenance_chains)
-    assays_with_pubs = sum(1 for c in provenance_chains if c['num_publications'] > 0)
+def create_provenance_chains(assay_tracking_df, pubs_by_study, study_summary, output_path):
+    """Create complete provenance chains, streamed to NDJSON as they are built"""
+    print("\n" + "="*80)
+    print("BUILDING: Data Provenance Chains")
+    print("="*80)
+
+    # Every tracked assay with a study code yields one chain, so the metadata
+    # header is known before the first chain is written
+    study_codes = assay_tracking_df['biobank_study_code']
+    metadata = {
+        'generation_date': datetime.now().isoformat(),
+        'total_chains': int(study_codes.notna().sum()),
+        'studies_covered': study_codes.nunique()
+    }
+
+    total_assays = 0
+    assays_with_pubs = 0
+    with open(output_path, 'wb') as f:
+        f.write(json_line({'metadata': metadata}))
+        for chain in iter_provenance_chains(assay_tracking_df, pubs_by_study, study_summary):
+            f.write(json_line(chain))
+            total_assays += 1
+            if chain['num_publications'] > 0:
+                assays_with_pubs += 1
 
+    print(f"\n✓ Created {total_assays} complete provenance chains")
+
+    # Summary statistics
     print(f"\nProvenance Summary:")
     print(f"  • Total assay-to-publication chains: {total_assays}")
     print(f"  • Chains with publications: {assays_with_pubs}")
     print(f"  • Chains without publications: {total_assays - assays_with_pubs}")
 
-    return provenance_chains
+    return total_assays
 
 
-def generate_cross_reference_tables(inventory_df, publications, assay_tracking_df):
+def generate_cross_reference_tables(study_summary, pubs_by_study, assay_tracking_df):
     """Generate cross-reference tables for dashboard navigation"""
     print("\n" + "="*80)
     print("GENERATING: Cross-Reference Tables")
     print("="*80)
 
-    # Study-level cross-reference
-    study_xref = []
-
-    for study_code in inventory_df['study_code'].unique():
-        study_samples = inventory_df[inventory_df['study_code'] == study_code]
-        study_assays = assay_tracking_df[assay_tracking_df['biobank_study_code'] == study_code]
-        study_pubs = [p for p in publications if p.get('biobank_study_code') == study_code]
-
-        xref = {
-            'study_code': study_code,
-            'total_samples': len(study_samples),
-            'participants': study_samples['participant_id'].nunique(),
-            'sample_types': study_samples['sample_type'].nunique(),
-            'assays_performed': len(study_assays),
-            'unique_assay_types': study_assays['Assay'].nunique() if len(study_assays) > 0 else 0,
-            'total_assay_samples': study_assays['Samples'].sum() if len(study_assays) > 0 else 0,
-            'publications': len(study_pubs),
-            'samples_available': (study_samples['is_available'] == True).sum(),
-            'samples_transferred': (study_samples['is_transferred'] == True).sum()
-        }
-        study_xref.append(xref)
-
-    study_xref_df = pd.DataFrame(study_xref)
+    # Study-level cross-reference, one column list per field
+    study_codes = list(study_summary)
+    summaries = list(study_summary.values())
+    assay_stats = assay_tracking_df.groupby('biobank_study_code', sort=False, observed=True).agg(
+        assays_performed=('Assay', 'size'),
+        unique_assay_types=('Assay', 'nunique'),
+        total_assay_samples=('Samples', 'sum')
+    ).to_dict('index')
+    no_assays = {'assays_performed': 0, 'unique_assay_types': 0, 'total_assay_samples': 0}
+    study_assays = [assay_stats.get(study_code, no_assays) for study_code in study_codes]
+
+    study_xref_df = pd.DataFrame({
+        'study_code': study_codes,
+        'total_samples': [summary.n_samples for summary in summaries],
+        'participants': [summary.n_participants for summary in summaries],
+        'sample_types': [summary.n_sample_types for summary in summaries],
+        'assays_performed': [assays['assays_performed'] for assays in study_assays],
+        'unique_assay_types': [assays['unique_assay_types'] for assays in study_assays],
+        'total_assay_samples': [assays['total_assay_samples'] for assays in study_assays],
+        'publications': [len(pubs_by_study.get(study_code, [])) for study_code in study_codes],
+        'samples_available': [summary.n_available for summary in summaries],
+        'samples_transferred': [summary.n_transferred for summary in summaries]
+    }, copy=False)
     print(f"\n✓ Created study-level cross-reference table with {len(study_xref_df)} studies")
     print("\nStudy Cross-Reference:")
     print(study_xref_df.to_string(index=False))
@@ -297,6 +450,19 @@ def generate_cross_reference_tables(inventory_df, publications, assay_tracking_d
     return study_xref_df
 
 
+# Inputs of the independent linkage stages, set before the worker pool forks so
+# the workers inherit the loaded frames instead of receiving pickled copies
+STAGE_INPUTS = {}
+
+
+def run_stage(func, *input_names):
+    """Run a linkage stage on STAGE_INPUTS, returning its result and printed report"""
+    report = io.StringIO()
+    with redirect_stdout(report):
+        result = func(*(STAGE_INPUTS[name] for name in input_names))
+    return result, report.getvalue()
+
+
 def main():
     """Main execution function"""
     print("="*80)
@@ -307,26 +473,66 @@ def main():
     output_dir = Path('data/processed/linkages')
     output_dir.mkdir(exist_ok=True, parents=True)
 
+    # Also write CSV copies of the bulk Parquet outputs
+    emit_csv = '--emit-csv' in sys.argv[1:]
+
+    # Opt-in polars backend for the sample-level join and counts (--engine polars)
+    args = sys.argv[1:]
+    engine = args[args.index('--engine') + 1] if '--engine' in args[:-1] else 'pandas'
+    if engine == 'polars' and pl is None:
+        print("⚠️  polars is not installed - using the pandas engine")
+        engine = 'pandas'
+
     # Step 1: Load all data
-    inventory_df, publications, assay_tracking_df, assay_data = load_all_data()
+    inventory_df, pubs_df, pubs_by_study, assay_tracking_df = load_all_data()
+
+    # Per-study inventory totals, shared by the study links, provenance chains and cross-reference
+    study_summary = build_study_summary(inventory_df)
+
+    # Steps 2, 3 and 7 only read the loaded data, so they run in forked worker
+    # processes while step 4 (the one large result) is built here; each
+    # stage's report is printed in step order once it finishes
+    STAGE_INPUTS.update(
+        inventory_df=inventory_df, pubs_df=pubs_df, pubs_by_study=pubs_by_study,
+        assay_tracking_df=assay_tracking_df, study_summary=study_summary, engine=engine
+    )
+    worker_stages = {
+        'pub_study_links': (link_publications_to_studies, 'pubs_df', 'study_summary'),
+        'pub_assay_links': (link_publications_to_assays, 'pubs_df', 'assay_tracking_df'),
+        'study_xref': (generate_cross_reference_tables, 'study_summary', 'pubs_by_study', 'assay_tracking_df')
+    }
+    if 'fork' in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=len(worker_stages),
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = {key: pool.submit(run_stage, *stage) for key, stage in worker_stages.items()}
+            sample_pub_stage = run_stage(create_sample_to_publication_map, 'inventory_df', 'pubs_df', 'engine')
+            stage_results = {key: future.result() for key, future in futures.items()}
+    else:
+        stage_results = {key: run_stage(*stage) for key, stage in worker_stages.items()}
+        sample_pub_stage = run_stage(create_sample_to_publication_map, 'inventory_df', 'pubs_df', 'engine')
 
     # Step 2: Link publications to studies
-    pub_study_links = link_publications_to_studies(publications, inventory_df)
+    pub_study_links, report = stage_results['pub_study_links']
+    print(report, end='')
 
     # Step 3: Link publications to assays
-    pub_assay_links = link_publications_to_assays(publications, assay_tracking_df)
+    pub_assay_links, report = stage_results['pub_assay_links']
+    print(report, end='')
 
     # Step 4: Map samples to publications
-    sample_pub_map = create_sample_to_publication_map(inventory_df, publications)
+    sample_pub_map, report = sample_pub_stage
+    print(report, end='')
 
     # Step 5: Identify multi-use samples
-    multi_use_samples = identify_multi_use_samples(sample_pub_map)
+    multi_use_samples = identify_multi_use_samples(sample_pub_map, engine)
 
-    # Step 6: Create provenance chains
-    provenance_chains = create_provenance_chains(inventory_df, assay_tracking_df, publications)
+    # Step 6: Create provenance chains, written one NDJSON line per chain
+    provenance_output = output_dir / 'data_provenance_chains.ndjson'
+    total_chains = create_provenance_chains(assay_tracking_df, pubs_by_study, study_summary, provenance_output)
 
     # Step 7: Generate cross-reference tables
-    study_xref = generate_cross_reference_tables(inventory_df, publications, assay_tracking_df)
+    study_xref, report = stage_results['study_xref']
+    print(report, end='')
 
     # Save outputs
     print("\n" + "="*80)
@@ -335,51 +541,49 @@ def main():
 
     # Save publication-to-study linkage
     pub_study_output = output_dir / 'publication_to_study_linkage.csv'
-    pub_study_links.to_csv(pub_study_output, index=False)
-    print(f"✓ Saved: {pub_study_output}")
+    write_csv(pub_study_links, pub_study_output, engine)
+    pub_study_links.to_parquet(pub_study_output.with_suffix('.parquet'), engine='pyarrow', index=False)
+    print(f"✓ Saved: {pub_study_output} (+ .parquet)")
 
     # Save publication-to-assay linkage
     pub_assay_output = output_dir / 'publication_to_assay_linkage.csv'
-    pub_assay_links.to_csv(pub_assay_output, index=False)
+    write_csv(pub_assay_links, pub_assay_output, engine)
     print(f"✓ Saved: {pub_assay_output}")
 
-    # Save sample-to-publication mapping (sample for large file)
-    sample_pub_output = output_dir / 'sample_to_publication_linkage.csv'
-    sample_pub_map.to_csv(sample_pub_output, index=False)
+    # Save sample-to-publication mapping - the bulk tables are written as
+    # zstd-compressed Parquet; CSV copies only with --emit-csv
+    sample_pub_output = output_dir / 'sample_to_publication_linkage.parquet'
+    sample_pub_map.to_parquet(sample_pub_output, engine='pyarrow', compression='zstd', index=False)
     print(f"✓ Saved: {sample_pub_output} ({len(sample_pub_map):,} records)")
+    if emit_csv:
+        write_csv(sample_pub_map, sample_pub_output.with_suffix('.csv'), engine)
+        print(f"✓ Saved: {sample_pub_output.with_suffix('.csv')}")
 
     # Save multi-use samples
-    multi_use_output = output_dir / 'multi_use_samples.csv'
-    multi_use_samples.to_csv(multi_use_output, index=False)
+    multi_use_output = output_dir / 'multi_use_samples.parquet'
+    multi_use_samples.to_parquet(multi_use_output, engine='pyarrow', compression='zstd', index=False)
     print(f"✓ Saved: {multi_use_output}")
+    if emit_csv:
+        write_csv(multi_use_samples, multi_use_output.with_suffix('.csv'), engine)
+        print(f"✓ Saved: {multi_use_output.with_suffix('.csv')}")
 
-    # Save provenance chains as JSON
-    provenance_output = output_dir / 'data_provenance_chains.json'
-    provenance_data = {
-        'metadata': {
-            'generation_date': datetime.now().isoformat(),
-            'total_chains': len(provenance_chains),
-            'studies_covered': len(set(c['study_code'] for c in provenance_chains))
-        },
-        'provenance_chains': provenance_chains
-    }
-    with open(provenance_output, 'w') as f:
-        json.dump(provenance_data, f, indent=2, default=str)
+    # Provenance chains were streamed to NDJSON in step 6
     print(f"✓ Saved: {provenance_output}")
 
     # Save cross-reference table
     xref_output = output_dir / 'study_cross_reference.csv'
-    study_xref.to_csv(xref_output, index=False)
-    print(f"✓ Saved: {xref_output}")
+    write_csv(study_xref, xref_output, engine)
+    study_xref.to_parquet(xref_output.with_suffix('.parquet'), engine='pyarrow', index=False)
+    print(f"✓ Saved: {xref_output} (+ .parquet)")
 
     # Save complete linkage data as JSON
     complete_linkage = {
         'metadata': {
             'generation_date': datetime.now().isoformat(),
             'total_samples': len(inventory_df),
-            'total_publications': len(publications),
+            'total_publications': len(pubs_df),
             'total_assays': len(assay_tracking_df),
-            'studies': inventory_df['study_code'].nunique()
+            'studies': len(study_summary)
         },
         'publication_study_links': pub_study_links.to_dict('records'),
         'publication_assay_links': pub_assay_links.to_dict('records'),
@@ -391,8 +595,7 @@ def main():
     }
 
     complete_output = output_dir / 'complete_linkage_data.json'
-    with open(complete_output, 'w') as f:
-        json.dump(complete_linkage, f, indent=2, default=str)
+    write_json(complete_output, complete_linkage)
     print(f"✓ Saved: {complete_output}")
 
     # Generate summary report
@@ -402,24 +605,24 @@ def main():
 
     print(f"\n📊 Data Processed:")
     print(f"  • Total samples: {len(inventory_df):,}")
-    print(f"  • Total publications: {len(publications)}")
+    print(f"  • Total publications: {len(pubs_df)}")
     print(f"  • Total assay records: {len(assay_tracking_df)}")
-    print(f"  • Studies covered: {inventory_df['study_code'].nunique()}")
+    print(f"  • Studies covered: {len(study_summary)}")
 
     print(f"\n🔗 Linkages Created:")
     print(f"  • Publication-to-study links: {len(pub_study_links)}")
     print(f"  • Publication-to-assay links: {len(pub_assay_links)}")
     print(f"  • Sample-to-publication mappings: {len(sample_pub_map):,}")
     print(f"  • Multi-use samples identified: {len(multi_use_samples):,}")
-    print(f"  • Provenance chains: {len(provenance_chains)}")
+    print(f"  • Provenance chains: {total_chains}")
 
     print(f"\n📁 Output Files:")
-    print(f"  • publication_to_study_linkage.csv")
+    print(f"  • publication_to_study_linkage.csv / .parquet")
     print(f"  • publication_to_assay_linkage.csv")
-    print(f"  • sample_to_publication_linkage.csv")
-    print(f"  • multi_use_samples.csv")
-    print(f"  • data_provenance_chains.json")
-    print(f"  • study_cross_reference.csv")
+    print(f"  • sample_to_publication_linkage.parquet")
+    print(f"  • multi_use_samples.parquet")
+    print(f"  • data_provenance_chains.ndjson")
+    print(f"  • study_cross_reference.csv / .parquet")
     print(f"  • complete_linkage_data.json")
 
     print("\n" + "="*80)
@@ -431,7 +634,7 @@ def main():
         'pub_assay_links': len(pub_assay_links),
         'sample_pub_mappings': len(sample_pub_map),
         'multi_use_samples': len(multi_use_samples),
-        'provenance_chains': len(provenance_chains)
+        'provenance_chains': total_chains
     }
 
 
@@ -4,11 +4,76 @@ Agent Data Locator
 Searches for missing files and documents data file locations
 """
 
-import pandas as pd
-import json
+import csv
 from pathlib import Path
 from datetime import datetime
 import os
+import re
+from stat import S_ISREG
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from json_io import write_json
+
+# Directories never worth cataloguing; hidden directories are skipped as well
+EXCLUDED_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.venv', '.mypy_cache', '.pytest_cache'})
+
+# Project directories the locator reports on
+DATA_RAW = Path('data/raw')
+DATA_PROCESSED = Path('data/processed')
+DATA_PUBS = Path('data/publications')
+SRC_DIR = Path('src/data-munging')
+
+# File names that suggest sequencing data, and how many such files to report
+SEQ_NAME_RE = re.compile(r'RNA|seq|FASTQ')
+MAX_SEQ_FILES = 20
+
+# stat results by path, shared by the scans so each file is stat'ed once per run
+STAT_CACHE = {}
+
+
+def cached_stat(path):
+    """os.stat(path), served from STAT_CACHE after the first call"""
+    key = os.fspath(path)
+    stat = STAT_CACHE.get(key)
+    if stat is None:
+        stat = STAT_CACHE[key] = os.stat(key)
+    return stat
+
+
+def write_csv(path, rows):
+    """Write a list of dicts as CSV, columns in order of first appearance"""
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def count_lines(path):
+    """Count lines in a file from its raw bytes, without decoding it"""
+    data = Path(path).read_bytes()
+    # A final line without a trailing newline still counts, as with readlines()
+    return data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0)
+
+
+def iter_files(root, prune=True):
+    """Yield a DirEntry for every file under root, in Path.rglob order"""
+    # One scandir per directory: DirEntry caches the file type, so telling
+    # files from directories costs no extra stat calls. Unless prune is
+    # False, excluded and hidden directories are skipped before descending
+    subdirs = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not prune or (entry.name not in EXCLUDED_DIRS and not entry.name.startswith('.')):
+                    subdirs.append(entry.path)
+            elif entry.is_file():
+                yield entry
+
+    for subdir in subdirs:
+        yield from iter_files(subdir, prune)
+
 
 def load_gaps_document():
     """Load gaps document to understand what's missing"""
@@ -18,15 +83,16 @@ def load_gaps_document():
 
     gaps_file = Path('docs/GAPS_AND_FOLLOWUP_QUESTIONS.md')
 
-    if gaps_file.exists():
-        print(f"✓ Loaded gaps document: {gaps_file}")
+    try:
         with open(gaps_file, 'r') as f:
             gaps_content = f.read()
-        return gaps_content
-    else:
+    except FileNotFoundError:
         print(f"⚠️  Gaps document not found at {gaps_file}")
         return None
 
+    print(f"✓ Loaded gaps document: {gaps_file}")
+    return gaps_content
+
 
 def search_for_missing_inventory_files():
     """Search for DU19-03 and any other missing inventory files"""
@@ -34,7 +100,6 @@ def search_for_missing_inventory_files():
     print("SEARCHING: Missing Inventory Files")
     print("="*80)
 
-    data_raw = Path('data/raw')
     found_files = []
     missing_files = []
 
@@ -44,28 +109,30 @@ def search_for_missing_inventory_files():
         'DU17-04', 'DU20-01', 'DU24-01', 'DU19-03'
     ]
 
-    print(f"\nSearching in: {data_raw.absolute()}")
+    print(f"\nSearching in: {DATA_RAW.absolute()}")
 
-    # Search for Excel files
-    excel_files = list(data_raw.glob('*.xlsx')) + list(data_raw.glob('*.xls'))
-    excel_files = [f for f in excel_files if not f.name.startswith('~')]
+    # Search for Excel files in a single directory read
+    try:
+        with os.scandir(DATA_RAW) as entries:
+            excel_files = [entry for entry in entries
+                           if entry.name.endswith(('.xlsx', '.xls')) and not entry.name.startswith('~')]
+    except FileNotFoundError:
+        excel_files = []
 
     print(f"Found {len(excel_files)} Excel files")
 
+    # Record each file and check which studies have inventory files; one
+    # alternation scans each filename once for every study code it contains
+    study_re = re.compile('|'.join(re.escape(study) for study in expected_studies))
+    found_study_codes = set()
     for file in excel_files:
         found_files.append({
             'filename': file.name,
-            'path': str(file.absolute()),
-            'size_mb': file.stat().st_size / (1024 * 1024),
+            'path': os.path.abspath(file.path),
+            'size_mb': cached_stat(file).st_size / (1024 * 1024),
             'type': 'Excel Inventory'
         })
-
-    # Check which studies have inventory files
-    found_study_codes = set()
-    for file in excel_files:
-        for study in expected_studies:
-            if study in file.name:
-                found_study_codes.add(study)
+        found_study_codes.update(study_re.findall(file.name))
 
     missing_study_codes = set(expected_studies) - found_study_codes
 
@@ -87,6 +154,21 @@ def search_for_missing_inventory_files():
     return found_files, missing_files
 
 
+def iter_sequencing_files(roots):
+    """Yield (absolute path, DirEntry) once for each likely sequencing file under roots"""
+    seen = set()
+    for root in roots:
+        try:
+            for entry in iter_files(root):
+                if SEQ_NAME_RE.search(entry.name) and cached_stat(entry).st_size > 1024:  # > 1KB
+                    path = os.path.abspath(entry.path)
+                    if path not in seen:
+                        seen.add(path)
+                        yield path, entry
+        except (FileNotFoundError, PermissionError):
+            continue
+
+
 def search_for_sequencing_data():
     """Search for RNA-seq and other sequencing data"""
     print("\n" + "="*80)
@@ -112,25 +194,15 @@ def search_for_sequencing_data():
 
     print(f"\nSearching for sequencing data patterns...")
 
-    for base_path in search_paths:
-        if not base_path.exists():
-            continue
-
-        # Limit search depth to avoid performance issues
-        for pattern in ['**/*RNA*', '**/*seq*', '**/*FASTQ*']:
-            try:
-                matches = list(base_path.glob(pattern))[:20]  # Limit results
-                for match in matches:
-                    if match.is_file() and match.stat().st_size > 1024:  # > 1KB
-                        found_seq_files.append({
-                            'filename': match.name,
-                            'path': str(match.absolute()),
-                            'size_mb': match.stat().st_size / (1024 * 1024),
-                            'type': 'Sequencing Data (potential)'
-                        })
-                        search_dirs.add(str(match.parent))
-            except PermissionError:
-                continue
+    # One walk per root; the search stops as soon as the cap is reached
+    for path, entry in islice(iter_sequencing_files(search_paths), MAX_SEQ_FILES):
+        found_seq_files.append({
+            'filename': entry.name,
+            'path': path,
+            'size_mb': cached_stat(entry).st_size / (1024 * 1024),
+            'type': 'Sequencing Data (potential)'
+        })
+        search_dirs.add(os.path.dirname(path))
 
     if len(found_seq_files) > 0:
         print(f"✓ Found {len(found_seq_files)} potential sequencing data files")
@@ -142,13 +214,55 @@ def search_for_sequencing_data():
     return found_seq_files
 
 
+def file_record(name, path, st):
+    """Structure-scan record for one file"""
+    return {
+        'filename': name,
+        'path': path,
+        'size_mb': round(st.st_size / (1024 * 1024), 2),
+        'modified': datetime.fromtimestamp(st.st_mtime).isoformat()
+    }
+
+
+def walk_dir(dir_path):
+    """File records for every non-hidden file under dir_path"""
+    if not hasattr(os, 'fwalk'):
+        return [file_record(entry.name, entry.path, cached_stat(entry))
+                for entry in iter_files(dir_path) if not entry.name.startswith('.')]
+
+    # fwalk keeps each directory open and stats its files relative to that
+    # descriptor (fstatat) instead of resolving every path from the root.
+    # Walking '.' from a descriptor opened on dir_path still follows a
+    # symlinked root, as the scandir walk did
+    files = []
+    root_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for dirpath, dirnames, filenames, dir_fd in os.fwalk('.', dir_fd=root_fd):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS and not d.startswith('.')]
+            dirpath = os.path.normpath(os.path.join(dir_path, dirpath))
+            for name in filenames:
+                if name.startswith('.'):
+                    continue
+                try:
+                    st = os.stat(name, dir_fd=dir_fd)
+                except FileNotFoundError:  # dangling symlink
+                    continue
+                if not S_ISREG(st.st_mode):
+                    continue
+                path = os.path.join(dirpath, name)
+                STAT_CACHE[path] = st
+                files.append(file_record(name, path, st))
+    finally:
+        os.close(root_fd)
+    return files
+
+
 def scan_project_structure():
     """Scan and document complete project file structure"""
     print("\n" + "="*80)
     print("SCANNING: Project File Structure")
     print("="*80)
 
-    base_path = Path('.')
     structure = {
         'data/raw': [],
         'data/processed': [],
@@ -158,34 +272,31 @@ def scan_project_structure():
         'docs': []
     }
 
-    for key in structure.keys():
-        dir_path = Path(key)
-        if dir_path.exists():
-            files = []
-            for item in dir_path.rglob('*'):
-                if item.is_file() and not item.name.startswith('.'):
-                    files.append({
-                        'filename': item.name,
-                        'path': str(item.relative_to(base_path)),
-                        'size_mb': round(item.stat().st_size / (1024 * 1024), 2),
-                        'modified': datetime.fromtimestamp(item.stat().st_mtime).isoformat()
-                    })
-            structure[key] = files
-            print(f"  {key}: {len(files)} files")
+    # The subtrees are independent and the walks are I/O-bound (scandir/stat
+    # release the GIL), so walk them concurrently and report in key order
+    with ThreadPoolExecutor(max_workers=min(8, len(structure))) as pool:
+        futures = {key: pool.submit(walk_dir, Path(key)) for key in structure}
+
+    for key, future in futures.items():
+        try:
+            structure[key] = future.result()
+        except FileNotFoundError:
+            continue
+        print(f"  {key}: {len(structure[key])} files")
 
     return structure
 
 
-def create_file_manifest():
-    """Create comprehensive file manifest"""
+def create_file_manifest(run_start, cwd):
+    """Create comprehensive file manifest stamped with the run start time and root"""
     print("\n" + "="*80)
     print("CREATING: Complete File Manifest")
     print("="*80)
 
     manifest = {
         'metadata': {
-            'scan_date': datetime.now().isoformat(),
-            'scan_location': str(Path('.').absolute())
+            'scan_date': run_start.isoformat(),
+            'scan_location': str(cwd)
         },
         'inventory_files': {
             'found': [],
@@ -208,60 +319,61 @@ def create_file_manifest():
     }
 
     # Inventory files
-    data_raw = Path('data/raw')
-    if data_raw.exists():
-        for f in data_raw.glob('*.xlsx'):
+    if DATA_RAW.exists():
+        for f in DATA_RAW.glob('*.xlsx'):
             if not f.name.startswith('~'):
                 manifest['inventory_files']['found'].append({
                     'filename': f.name,
                     'path': str(f),
-                    'size_mb': f.stat().st_size / (1024 * 1024)
+                    'size_mb': cached_stat(f).st_size / (1024 * 1024)
                 })
 
     # Processed data
     processed_dirs = {
-        'harmonized': Path('data/processed'),
-        'linkages': Path('data/processed/linkages'),
-        'validation': Path('data/processed/validation')
+        'harmonized': DATA_PROCESSED,
+        'linkages': DATA_PROCESSED / 'linkages',
+        'validation': DATA_PROCESSED / 'validation'
     }
 
     for key, dir_path in processed_dirs.items():
-        if dir_path.exists():
-            for f in dir_path.glob('*'):
-                if f.is_file():
-                    manifest['processed_data'][key].append({
-                        'filename': f.name,
-                        'path': str(f),
-                        'size_mb': f.stat().st_size / (1024 * 1024)
-                    })
+        # DirEntry.is_file() answers from the directory listing, no lstat
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        manifest['processed_data'][key].append({
+                            'filename': entry.name,
+                            'path': entry.path,
+                            'size_mb': cached_stat(entry).st_size / (1024 * 1024)
+                        })
+        except FileNotFoundError:
+            continue
 
     # Publications
-    pub_dir = Path('data/publications')
-    if pub_dir.exists():
-        pdf_dir = pub_dir / 'pdfs'
+    if DATA_PUBS.exists():
+        pdf_dir = DATA_PUBS / 'pdfs'
         if pdf_dir.exists():
             for f in pdf_dir.glob('*.pdf'):
                 manifest['publications']['pdfs'].append({
                     'filename': f.name,
                     'path': str(f),
-                    'size_mb': f.stat().st_size / (1024 * 1024)
+                    'size_mb': cached_stat(f).st_size / (1024 * 1024)
                 })
 
-        for f in pub_dir.glob('*.json'):
+        for f in DATA_PUBS.glob('*.json'):
             manifest['publications']['citations'].append({
                 'filename': f.name,
                 'path': str(f),
-                'size_kb': f.stat().st_size / 1024
+                'size_kb': cached_stat(f).st_size / 1024
             })
 
     # Scripts
-    src_dir = Path('src/data-munging')
-    if src_dir.exists():
-        for f in src_dir.glob('*.py'):
+    if SRC_DIR.exists():
+        for f in SRC_DIR.glob('*.py'):
             manifest['scripts'].append({
                 'filename': f.name,
                 'path': str(f),
-                'lines': len(open(f).readlines())
+                'lines': count_lines(f)
             })
 
     print(f"\n✓ Manifest created:")
@@ -273,14 +385,14 @@ def create_file_manifest():
     return manifest
 
 
-def document_data_access_paths():
+def document_data_access_paths(run_start, cwd):
     """Create data access guide"""
     print("\n" + "="*80)
     print("DOCUMENTING: Data Access Paths")
     print("="*80)
 
-    access_guide = """# Data Access Guide
-**Generated**: {date}
+    access_guide = f"""# Data Access Guide
+**Generated**: {run_start:%Y-%m-%d}
 
 ## Available Data
 
@@ -320,9 +432,9 @@ with open('data/publications/citations.json', 'r') as f:
 **Files**:
 - `publication_to_study_linkage.csv` - Links publications to studies
 - `publication_to_assay_linkage.csv` - Links publications to assays
-- `sample_to_publication_linkage.csv` - Maps samples to publications (316K records)
-- `multi_use_samples.csv` - Samples used in multiple publications
-- `data_provenance_chains.json` - Complete provenance graphs
+- `sample_to_publication_linkage.parquet` - Maps samples to publications (316K records)
+- `multi_use_samples.parquet` - Samples used in multiple publications
+- `data_provenance_chains.ndjson` - Complete provenance graphs (metadata line, then one chain per line)
 - `study_cross_reference.csv` - Study-level summary
 
 ### 5. Validation Reports
@@ -390,11 +502,11 @@ with open('data/publications/citations.json', 'r') as f:
 - Contact PI for collaboration requests
 
 ## Notes
-- All paths are relative to project root: `{project_root}`
+- All paths are relative to project root: `{cwd}`
 - Parquet files require pandas >= 1.0 or Apache Arrow
 - Some data may require decompression (*.gz files)
 - Check IRB protocols for data usage restrictions
-""".format(date=datetime.now().strftime('%Y-%m-%d'), project_root=Path('.').absolute())
+"""
 
     print("✓ Data access guide created")
     return access_guide
@@ -409,19 +521,20 @@ def create_storage_location_map():
     storage_map = {
         'local_storage': {
             'raw_data': {
-                'path': 'data/raw',
+                'path': str(DATA_RAW),
                 'type': 'Excel inventory files',
-                'count': len(list(Path('data/raw').glob('*.xlsx'))) if Path('data/raw').exists() else 0
+                'count': len(list(DATA_RAW.glob('*.xlsx'))) if DATA_RAW.exists() else 0
             },
             'processed_data': {
-                'path': 'data/processed',
+                'path': str(DATA_PROCESSED),
                 'type': 'Harmonized datasets, linkages, validation',
-                'size_mb': sum(f.stat().st_size for f in Path('data/processed').rglob('*') if f.is_file()) / (1024 * 1024) if Path('data/processed').exists() else 0
+                # A storage total, so hidden and tool directories count too
+                'size_mb': sum(cached_stat(entry).st_size for entry in iter_files(DATA_PROCESSED, prune=False)) / (1024 * 1024) if DATA_PROCESSED.exists() else 0
             },
             'publications': {
-                'path': 'data/publications',
+                'path': str(DATA_PUBS),
                 'type': 'PDFs and citation database',
-                'pdf_count': len(list(Path('data/publications/pdfs').glob('*.pdf'))) if Path('data/publications/pdfs').exists() else 0
+                'pdf_count': len(list((DATA_PUBS / 'pdfs').glob('*.pdf'))) if (DATA_PUBS / 'pdfs').exists() else 0
             }
         },
         'external_storage': {
@@ -476,7 +589,11 @@ def main():
     print("Searching for missing files and documenting data locations")
     print("="*80)
 
-    output_dir = Path('data/processed/file_locations')
+    # One timestamp and root for the whole run so every output agrees
+    run_start = datetime.now()
+    cwd = Path.cwd()
+
+    output_dir = DATA_PROCESSED / 'file_locations'
     output_dir.mkdir(exist_ok=True, parents=True)
 
     # Step 1: Load gaps document
@@ -492,10 +609,10 @@ def main():
     project_structure = scan_project_structure()
 
     # Step 5: Create file manifest
-    file_manifest = create_file_manifest()
+    file_manifest = create_file_manifest(run_start, cwd)
 
     # Step 6: Document data access paths
-    access_guide = document_data_access_paths()
+    access_guide = document_data_access_paths(run_start, cwd)
 
     # Step 7: Create storage location map
     storage_map = create_storage_location_map()
@@ -507,14 +624,13 @@ def main():
 
     # Save file manifest
     manifest_output = output_dir / 'file_manifest.json'
-    with open(manifest_output, 'w') as f:
-        json.dump(file_manifest, f, indent=2, default=str)
+    write_json(manifest_output, file_manifest)
     print(f"✓ Saved: {manifest_output}")
 
     # Save missing files report
     missing_report = {
         'metadata': {
-            'scan_date': datetime.now().isoformat(),
+            'scan_date': run_start.isoformat(),
             'total_missing': len(missing_inventory)
         },
         'missing_inventory_files': missing_inventory,
@@ -524,24 +640,32 @@ def main():
 
     missing_output = output_dir / 'missing_files_report.csv'
     if len(missing_inventory) > 0:
-        pd.DataFrame(missing_inventory).to_csv(missing_output, index=False)
+        write_csv(missing_output, missing_inventory)
         print(f"✓ Saved: {missing_output}")
 
     missing_json = output_dir / 'missing_files_report.json'
-    with open(missing_json, 'w') as f:
-        json.dump(missing_report, f, indent=2)
+    write_json(missing_json, missing_report)
     print(f"✓ Saved: {missing_json}")
 
     # Save data access guide
+    # The guide only changes with the date or project root; leave it alone
+    # when an identical copy is already on disk
     guide_output = output_dir / 'data_access_guide.md'
-    with open(guide_output, 'w') as f:
-        f.write(access_guide)
-    print(f"✓ Saved: {guide_output}")
+    try:
+        with open(guide_output, 'r') as f:
+            guide_unchanged = f.read() == access_guide
+    except FileNotFoundError:
+        guide_unchanged = False
+    if guide_unchanged:
+        print(f"✓ Up to date: {guide_output}")
+    else:
+        with open(guide_output, 'w') as f:
+            f.write(access_guide)
+        print(f"✓ Saved: {guide_output}")
 
     # Save storage locations
     storage_output = output_dir / 'storage_locations.json'
-    with open(storage_output, 'w') as f:
-        json.dump(storage_map, f, indent=2)
+    write_json(storage_output, storage_map)
     print(f"✓ Saved: {storage_output}")
 
     # Save data size inventory
@@ -556,9 +680,8 @@ def main():
             })
 
     if len(size_data) > 0:
-        size_df = pd.DataFrame(size_data)
         size_output = output_dir / 'data_size_inventory.csv'
-        size_df.to_csv(size_output, index=False)
+        write_csv(size_output, size_data)
         print(f"✓ Saved: {size_output}")
 
     # Summary report
@@ -9,10 +9,11 @@ Author: Claude Code
 Date: December 4, 2025
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+from json_io import write_json, read_json
+
 
 def scrub_samples():
     """
@@ -28,39 +29,33 @@ def scrub_samples():
 
     # Load private data
     private_file = Path('public/data/samples_private.json')
-    if not private_file.exists():
+    try:
+        samples = read_json(private_file)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Private samples file not found: {private_file}\n"
             "Please run convert_data_for_dashboard.py first."
-        )
+        ) from None
 
-    with open(private_file, 'r') as f:
-        samples = json.load(f)
-
-    # Remove storage locations
-    scrubbed = []
+    # Remove storage locations, in place: the parsed list is only used to
+    # produce the public file, so there is no need to copy every record
+    key = 'storage_location_path'
     removed_count = 0
 
     for sample in samples:
-        scrubbed_sample = sample.copy()
-
-        # Check if storage location exists
-        if sample.get('storage_location_path'):
+        # Count storage locations that were set, then null them for the public version
+        if sample.get(key):
             removed_count += 1
-
-        # Set to null in public version
-        scrubbed_sample['storage_location_path'] = None
-        scrubbed.append(scrubbed_sample)
+        sample[key] = None
 
     # Save public version
     public_file = Path('public/data/samples_public.json')
-    with open(public_file, 'w') as f:
-        json.dump(scrubbed, f, indent=2)
+    write_json(public_file, samples)
 
-    print(f"✓ Scrubbed {len(scrubbed):,} samples")
+    print(f"✓ Scrubbed {len(samples):,} samples")
     print(f"✓ Removed {removed_count:,} storage locations")
 
-    return scrubbed, removed_count
+    return samples, removed_count
 
 
 def scrub_statistics():
@@ -74,19 +69,17 @@ def scrub_statistics():
 
     # Load private statistics
     private_file = Path('public/data/sample_statistics_private.json')
-    if not private_file.exists():
+    try:
+        stats = read_json(private_file)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Private statistics file not found: {private_file}\n"
             "Please run convert_data_for_dashboard.py first."
-        )
-
-    with open(private_file, 'r') as f:
-        stats = json.load(f)
+        ) from None
 
     # No PHI in statistics, safe to copy as-is
     public_file = Path('public/data/sample_statistics_public.json')
-    with open(public_file, 'w') as f:
-        json.dump(stats, f, indent=2)
+    write_json(public_file, stats)
 
     print("✓ Public statistics created")
 
@@ -138,9 +131,7 @@ def create_audit_log(total_samples, storage_removed):
     # Save audit log
     audit_file = Path('data/processed/scrubber_audit_log.json')
     audit_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(audit_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    write_json(audit_file, report)
 
     print(f"✓ Audit log saved to {audit_file}")
 
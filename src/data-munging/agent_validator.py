@@ -5,10 +5,75 @@ Validates data consistency, integrity, and completeness across all processed dat
 """
 
 import pandas as pd
-import json
+import numpy as np
+import pyarrow.parquet as pq
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from json_io import write_json, read_json
+
+# Inventory columns read by the checks; storage_location_path is optional
+INVENTORY_COLS = ['study_code', 'participant_id', 'sample_barcode_id', 'sample_type',
+                  'timepoint_normalized', 'timepoint_day', 'storage_location_path',
+                  'is_available', 'is_transferred']
+
+
+def missing_from(values, reference):
+    """Unique non-null entries of values not in reference, in order of first appearance"""
+    # setdiff1d works on the numpy arrays directly rather than on Python sets
+    return np.setdiff1d(pd.unique(values.dropna().to_numpy()), reference, assume_unique=True).tolist()
+
+
+def nan_report(df, col, id_col='sample_barcode_id', head=10):
+    """Number of rows where col is null, and the id_col values of the first few"""
+    # Positions of the null rows only; no filtered copy of the frame is built
+    rows = np.flatnonzero(df[col].isna().to_numpy())
+    return rows.size, df[id_col].iloc[rows[:head]].tolist()
+
+
+def read_inventory(path):
+    """Read the harmonized inventory, keeping only INVENTORY_COLS present in the file"""
+    inventory_columns = set(pq.read_schema(path).names)
+    inventory = pd.read_parquet(
+        path, engine='pyarrow',
+        columns=[col for col in INVENTORY_COLS if col in inventory_columns]
+    )
+    # Low-cardinality keys the checks group, count and compare on
+    for col in ('study_code', 'sample_type', 'timepoint_normalized'):
+        inventory[col] = inventory[col].astype('category')
+    return inventory
+
+
+def summarize_publications(publications):
+    """Counts and study codes the checks need, gathered in one pass over publications"""
+    summary = {'with_pmid': 0, 'with_study_code': 0, 'unassigned': [], 'study_codes': set()}
+    for pub in publications:
+        if pub.get('pmid') not in ('N/A', None):
+            summary['with_pmid'] += 1
+        study_code = pub.get('biobank_study_code')
+        if study_code == 'Unknown':
+            summary['unassigned'].append(pub)
+        else:
+            summary['with_study_code'] += 1
+            if study_code is not None:
+                summary['study_codes'].add(study_code)
+    return summary
+
+
+def read_linkage_table(path):
+    """Read a linker table from its Parquet copy, or from the CSV when there is none"""
+    try:
+        return pd.read_parquet(Path(path).with_suffix('.parquet'), engine='pyarrow')
+    except FileNotFoundError:
+        return pd.read_csv(path, engine='pyarrow')
+
+
+def read_csv(path):
+    """Read a CSV with the multithreaded Arrow parser"""
+    return pd.read_csv(path, engine='pyarrow')
+
 
 def load_all_datasets():
     """Load all processed datasets for validation"""
@@ -16,32 +81,40 @@ def load_all_datasets():
     print("AGENT VALIDATOR - Loading Datasets")
     print("="*80)
 
-    datasets = {}
+    loaders = {
+        'inventory': (read_inventory, 'data/processed/combined_inventory_harmonized.parquet'),
+        'citations': (read_json, 'data/publications/citations.json'),
+        'assay_tracking': (read_csv, 'data/processed/assay_tracking_table.csv'),
+        'linkages': (read_json, 'data/processed/linkages/complete_linkage_data.json'),
+        'pub_study_links': (read_linkage_table, 'data/processed/linkages/publication_to_study_linkage.csv'),
+        'study_xref': (read_linkage_table, 'data/processed/linkages/study_cross_reference.csv'),
+    }
+
+    # The files are independent, and file reads and Arrow decoding release
+    # the GIL, so threads overlap the loads; results are reported in order
+    with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+        futures = {name: pool.submit(func, path) for name, (func, path) in loaders.items()}
+    datasets = {name: future.result() for name, future in futures.items()}
 
-    # Load harmonized inventory
     print("\n1. Loading harmonized inventory...")
-    datasets['inventory'] = pd.read_parquet('data/processed/combined_inventory_harmonized.parquet')
     print(f"   ✓ Loaded {len(datasets['inventory']):,} samples")
 
-    # Load citations
     print("\n2. Loading citation database...")
-    with open('data/publications/citations.json', 'r') as f:
-        datasets['citations'] = json.load(f)
     print(f"   ✓ Loaded {len(datasets['citations']['publications'])} publications")
 
-    # Load assay tracking
     print("\n3. Loading assay tracking...")
-    datasets['assay_tracking'] = pd.read_csv('data/processed/assay_tracking_table.csv')
     print(f"   ✓ Loaded {len(datasets['assay_tracking'])} assay records")
 
-    # Load linkage data
     print("\n4. Loading linkage data...")
-    with open('data/processed/linkages/complete_linkage_data.json', 'r') as f:
-        datasets['linkages'] = json.load(f)
     print(f"   ✓ Loaded linkage data")
 
-    datasets['pub_study_links'] = pd.read_csv('data/processed/linkages/publication_to_study_linkage.csv')
-    datasets['study_xref'] = pd.read_csv('data/processed/linkages/study_cross_reference.csv')
+    # Values shared by several checks: the inventory's study codes, and the
+    # storage flags as plain boolean arrays with nulls counted as False
+    inventory = datasets['inventory']
+    datasets['inventory_studies'] = pd.Index(pd.unique(inventory['study_code'].dropna().to_numpy()))
+    datasets['is_available'] = inventory['is_available'].to_numpy(dtype=bool, na_value=False)
+    datasets['is_transferred'] = inventory['is_transferred'].to_numpy(dtype=bool, na_value=False)
+    datasets['publication_summary'] = summarize_publications(datasets['citations']['publications'])
 
     return datasets
 
@@ -61,16 +134,14 @@ def validate_referential_integrity(datasets):
 
     # Check 1: All publication-linked study codes exist in inventory
     print("\n1. Checking publication-to-study references...")
-    pub_studies = set(pub_study_links['study_code'].unique())
-    inventory_studies = set(inventory['study_code'].unique())
-
-    missing_studies = pub_studies - inventory_studies
+    inventory_studies = datasets['inventory_studies']
+    missing_studies = missing_from(pub_study_links['study_code'], inventory_studies)
     if len(missing_studies) > 0:
         issue = {
             'check': 'publication_study_references',
             'severity': 'WARNING',
             'message': f'Publications reference {len(missing_studies)} study codes not in inventory',
-            'details': list(missing_studies)
+            'details': missing_studies
         }
         warnings.append(issue)
         print(f"   ⚠️  {issue['message']}: {missing_studies}")
@@ -79,15 +150,14 @@ def validate_referential_integrity(datasets):
 
     # Check 2: All assay-tracking study codes exist in inventory
     print("\n2. Checking assay-to-study references...")
-    assay_studies = set(assay_tracking['biobank_study_code'].dropna().unique())
-    missing_assay_studies = assay_studies - inventory_studies
+    missing_assay_studies = missing_from(assay_tracking['biobank_study_code'], inventory_studies)
 
     if len(missing_assay_studies) > 0:
         issue = {
             'check': 'assay_study_references',
             'severity': 'ERROR',
             'message': f'Assays reference {len(missing_assay_studies)} study codes not in inventory',
-            'details': list(missing_assay_studies)
+            'details': missing_assay_studies
         }
         issues.append(issue)
         print(f"   🔴 {issue['message']}: {missing_assay_studies}")
@@ -96,13 +166,13 @@ def validate_referential_integrity(datasets):
 
     # Check 3: Participant ID consistency
     print("\n3. Checking participant ID format...")
-    invalid_pids = inventory[inventory['participant_id'].isna()]
-    if len(invalid_pids) > 0:
+    n_invalid_pids, invalid_pid_barcodes = nan_report(inventory, 'participant_id')
+    if n_invalid_pids > 0:
         issue = {
             'check': 'participant_id_missing',
             'severity': 'ERROR',
-            'message': f'{len(invalid_pids)} samples missing participant IDs',
-            'details': invalid_pids['sample_barcode_id'].head(10).tolist()
+            'message': f'{n_invalid_pids} samples missing participant IDs',
+            'details': invalid_pid_barcodes
         }
         issues.append(issue)
         print(f"   🔴 {issue['message']}")
@@ -111,13 +181,16 @@ def validate_referential_integrity(datasets):
 
     # Check 4: Sample barcode uniqueness
     print("\n4. Checking sample barcode uniqueness...")
-    duplicate_barcodes = inventory[inventory.duplicated(subset=['sample_barcode_id'], keep=False)]
-    if len(duplicate_barcodes) > 0:
+    # One hash pass over the barcodes; only the repeated ones are kept, in
+    # order of first appearance
+    barcode_counts = inventory['sample_barcode_id'].value_counts(sort=False, dropna=False)
+    duplicate_counts = barcode_counts[barcode_counts.to_numpy() > 1]
+    if len(duplicate_counts) > 0:
         issue = {
             'check': 'sample_barcode_duplicates',
             'severity': 'ERROR',
-            'message': f'{len(duplicate_barcodes)} duplicate sample barcodes found',
-            'details': duplicate_barcodes['sample_barcode_id'].unique()[:10].tolist()
+            'message': f'{duplicate_counts.sum()} duplicate sample barcodes found',
+            'details': duplicate_counts.index[:10].tolist()
         }
         issues.append(issue)
         print(f"   🔴 {issue['message']}")
@@ -136,23 +209,22 @@ def check_orphaned_records(datasets):
 
     orphans = []
 
-    inventory = datasets['inventory']
     assay_tracking = datasets['assay_tracking']
-    publications = datasets['citations']['publications']
+    publication_summary = datasets['publication_summary']
 
     # Check 1: Studies in inventory but not in publications
     print("\n1. Checking for studies without publications...")
-    inventory_studies = set(inventory['study_code'].unique())
-    pub_studies = set(p.get('biobank_study_code', 'Unknown') for p in publications if p.get('biobank_study_code') != 'Unknown')
+    inventory_studies = datasets['inventory_studies']
+    pub_studies = list(publication_summary['study_codes'])
 
-    studies_without_pubs = inventory_studies - pub_studies
+    studies_without_pubs = np.setdiff1d(inventory_studies, pub_studies, assume_unique=True).tolist()
     if len(studies_without_pubs) > 0:
         orphan = {
             'type': 'studies_without_publications',
             'severity': 'WARNING',
             'count': len(studies_without_pubs),
             'message': f'{len(studies_without_pubs)} studies have no associated publications',
-            'details': list(studies_without_pubs)
+            'details': studies_without_pubs
         }
         orphans.append(orphan)
         print(f"   ⚠️  {orphan['message']}: {studies_without_pubs}")
@@ -161,8 +233,7 @@ def check_orphaned_records(datasets):
 
     # Check 2: Studies with assays but not in inventory (DU19-03 issue!)
     print("\n2. Checking for assays without inventory records...")
-    assay_studies = set(assay_tracking['biobank_study_code'].dropna().unique())
-    assays_without_inventory = assay_studies - inventory_studies
+    assays_without_inventory = missing_from(assay_tracking['biobank_study_code'], inventory_studies)
 
     if len(assays_without_inventory) > 0:
         orphan = {
@@ -170,7 +241,7 @@ def check_orphaned_records(datasets):
             'severity': 'ERROR',
             'count': len(assays_without_inventory),
             'message': f'{len(assays_without_inventory)} studies have assays but no inventory records',
-            'details': list(assays_without_inventory)
+            'details': assays_without_inventory
         }
         orphans.append(orphan)
         print(f"   🔴 {orphan['message']}: {assays_without_inventory}")
@@ -180,7 +251,7 @@ def check_orphaned_records(datasets):
 
     # Check 3: Publications with Unknown study codes
     print("\n3. Checking for publications without study assignments...")
-    unknown_pubs = [p for p in publications if p.get('biobank_study_code') == 'Unknown']
+    unknown_pubs = publication_summary['unassigned']
     if len(unknown_pubs) > 0:
         orphan = {
             'type': 'publications_without_studies',
@@ -212,42 +283,41 @@ def validate_data_conflicts(datasets):
 
     # Check 1: Sample count mismatches
     print("\n1. Checking for sample count consistency...")
-    for _, xref in study_xref.iterrows():
-        study_code = xref['study_code']
-        xref_count = xref['total_samples']
-
-        inv_count = len(inventory[inventory['study_code'] == study_code])
-
-        if xref_count != inv_count:
-            conflict = {
-                'type': 'sample_count_mismatch',
-                'severity': 'WARNING',
-                'study_code': study_code,
-                'inventory_count': inv_count,
-                'xref_count': xref_count,
-                'difference': abs(inv_count - xref_count),
-                'message': f'{study_code}: Cross-ref shows {xref_count} samples, inventory has {inv_count}'
-            }
-            conflicts.append(conflict)
-            print(f"   ⚠️  {conflict['message']}")
+    # Count every study's samples in one groupby, then visit only the
+    # cross-reference rows that disagree with it
+    inv_counts = inventory.groupby('study_code', sort=False, observed=True).size()
+    xref_counts = study_xref[['study_code', 'total_samples']].assign(
+        inventory_count=study_xref['study_code'].map(inv_counts).fillna(0).astype(int)
+    )
+    mismatched = xref_counts[xref_counts['total_samples'] != xref_counts['inventory_count']]
+
+    for study_code, xref_count, inv_count in mismatched.itertuples(index=False):
+        conflict = {
+            'type': 'sample_count_mismatch',
+            'severity': 'WARNING',
+            'study_code': study_code,
+            'inventory_count': inv_count,
+            'xref_count': xref_count,
+            'difference': abs(inv_count - xref_count),
+            'message': f'{study_code}: Cross-ref shows {xref_count} samples, inventory has {inv_count}'
+        }
+        conflicts.append(conflict)
+        print(f"   ⚠️  {conflict['message']}")
 
     if len([c for c in conflicts if c['type'] == 'sample_count_mismatch']) == 0:
         print(f"   ✓ Sample counts consistent across datasets")
 
     # Check 2: Storage status logic
     print("\n2. Checking storage status logic...")
-    illogical_status = inventory[
-        (inventory['is_available'] == True) &
-        (inventory['is_transferred'] == True)
-    ]
+    illogical_rows = np.flatnonzero(datasets['is_available'] & datasets['is_transferred'])
 
-    if len(illogical_status) > 0:
+    if illogical_rows.size > 0:
         conflict = {
             'type': 'illogical_storage_status',
             'severity': 'ERROR',
-            'count': len(illogical_status),
-            'message': f'{len(illogical_status)} samples marked as both available AND transferred',
-            'details': illogical_status['sample_barcode_id'].head(10).tolist()
+            'count': illogical_rows.size,
+            'message': f'{illogical_rows.size} samples marked as both available AND transferred',
+            'details': inventory['sample_barcode_id'].iloc[illogical_rows[:10]].tolist()
         }
         conflicts.append(conflict)
         print(f"   🔴 {conflict['message']}")
@@ -262,18 +332,22 @@ def validate_data_conflicts(datasets):
         ('storage_location_path', 'storage location')
     ]
 
+    # Null counts for all the fields present, from a single count() pass
+    present_fields = [field for field, _ in missing_checks if field in inventory.columns]
+    missing_counts = (len(inventory) - inventory[present_fields].count()).to_dict()
+
     for field, description in missing_checks:
-        if field in inventory.columns:
-            missing = inventory[inventory[field].isna()]
-            pct_missing = (len(missing) / len(inventory)) * 100
+        if field in missing_counts:
+            n_missing = missing_counts[field]
+            pct_missing = (n_missing / len(inventory)) * 100
 
             if pct_missing > 5:  # More than 5% missing
                 conflict = {
                     'type': f'missing_{field}',
                     'severity': 'WARNING',
-                    'count': len(missing),
+                    'count': n_missing,
                     'percentage': round(pct_missing, 2),
-                    'message': f'{len(missing)} samples ({pct_missing:.1f}%) missing {description}'
+                    'message': f'{n_missing} samples ({pct_missing:.1f}%) missing {description}'
                 }
                 conflicts.append(conflict)
                 print(f"   ⚠️  {conflict['message']}")
@@ -297,15 +371,15 @@ def validate_timepoint_consistency(datasets):
 
     # Check 1: All timepoints have normalized versions
     print("\n1. Checking timepoint normalization...")
-    missing_normalized = inventory[inventory['timepoint_normalized'].isna()]
+    n_missing_normalized, _ = nan_report(inventory, 'timepoint_normalized', head=0)
 
-    if len(missing_normalized) > 0:
+    if n_missing_normalized > 0:
         issue = {
             'check': 'timepoint_normalization',
             'severity': 'ERROR',
-            'count': len(missing_normalized),
-            'percentage': (len(missing_normalized) / len(inventory)) * 100,
-            'message': f'{len(missing_normalized)} samples without normalized timepoints'
+            'count': n_missing_normalized,
+            'percentage': (n_missing_normalized / len(inventory)) * 100,
+            'message': f'{n_missing_normalized} samples without normalized timepoints'
         }
         issues.append(issue)
         print(f"   🔴 {issue['message']}")
@@ -314,17 +388,17 @@ def validate_timepoint_consistency(datasets):
 
     # Check 2: Timepoint day/hour consistency
     print("\n2. Checking timepoint day/hour values...")
-    invalid_days = inventory[
-        (inventory['timepoint_day'].notna()) &
-        ((inventory['timepoint_day'] < -30) | (inventory['timepoint_day'] > 365))
-    ]
+    # Comparisons with NaN are False, so missing days drop out of the range
+    # test without a separate notna() pass
+    days = inventory['timepoint_day'].to_numpy(dtype=np.float64, na_value=np.nan)
+    n_invalid_days = np.count_nonzero((days < -30) | (days > 365))
 
-    if len(invalid_days) > 0:
+    if n_invalid_days > 0:
         issue = {
             'check': 'timepoint_day_range',
             'severity': 'WARNING',
-            'count': len(invalid_days),
-            'message': f'{len(invalid_days)} samples with unusual timepoint days (< -30 or > 365)'
+            'count': n_invalid_days,
+            'message': f'{n_invalid_days} samples with unusual timepoint days (< -30 or > 365)'
         }
         issues.append(issue)
         print(f"   ⚠️  {issue['message']}")
@@ -333,20 +407,19 @@ def validate_timepoint_consistency(datasets):
 
     # Check 3: Study-level timepoint coverage
     print("\n3. Checking timepoint coverage by study...")
-    for study_code in inventory['study_code'].unique():
-        study_samples = inventory[inventory['study_code'] == study_code]
-        unique_timepoints = study_samples['timepoint_normalized'].nunique()
-
-        if unique_timepoints < 3:
-            issue = {
-                'check': 'timepoint_coverage',
-                'severity': 'INFO',
-                'study_code': study_code,
-                'unique_timepoints': unique_timepoints,
-                'message': f'{study_code}: Only {unique_timepoints} unique timepoints (expected 5-10 for challenge studies)'
-            }
-            issues.append(issue)
-            print(f"   ℹ️  {issue['message']}")
+    timepoint_counts = inventory.groupby('study_code', sort=False, observed=True)['timepoint_normalized'].nunique()
+    low_coverage = timepoint_counts[timepoint_counts < 3]
+
+    for study_code, unique_timepoints in low_coverage.items():
+        issue = {
+            'check': 'timepoint_coverage',
+            'severity': 'INFO',
+            'study_code': study_code,
+            'unique_timepoints': unique_timepoints,
+            'message': f'{study_code}: Only {unique_timepoints} unique timepoints (expected 5-10 for challenge studies)'
+        }
+        issues.append(issue)
+        print(f"   ℹ️  {issue['message']}")
 
     if len([i for i in issues if i.get('check') == 'timepoint_coverage']) == 0:
         print(f"   ✓ All studies have adequate timepoint coverage")
@@ -363,30 +436,35 @@ def generate_quality_metrics(datasets):
 
     inventory = datasets['inventory']
     publications = datasets['citations']['publications']
+    publication_summary = datasets['publication_summary']
     assay_tracking = datasets['assay_tracking']
+    is_available = datasets['is_available']
+    n_samples = len(inventory)
+
+    # Non-null counts for every completeness column in one pass
+    completeness_cols = ['participant_id', 'sample_type', 'timepoint_normalized']
+    if 'storage_location_path' in inventory.columns:
+        completeness_cols.append('storage_location_path')
+    completeness = (inventory[completeness_cols].count() / n_samples * 100).to_dict()
+    completeness['storage_location'] = completeness.pop('storage_location_path', 0)
 
     metrics = {
         'inventory': {
-            'total_samples': len(inventory),
+            'total_samples': n_samples,
             'studies': inventory['study_code'].nunique(),
             'participants': inventory['participant_id'].nunique(),
             'sample_types': inventory['sample_type'].nunique(),
-            'completeness': {
-                'participant_id': (inventory['participant_id'].notna().sum() / len(inventory)) * 100,
-                'sample_type': (inventory['sample_type'].notna().sum() / len(inventory)) * 100,
-                'timepoint_normalized': (inventory['timepoint_normalized'].notna().sum() / len(inventory)) * 100,
-                'storage_location': (inventory['storage_location_path'].notna().sum() / len(inventory)) * 100 if 'storage_location_path' in inventory.columns else 0
-            },
+            'completeness': completeness,
             'availability': {
-                'available': (inventory['is_available'] == True).sum(),
-                'transferred': (inventory['is_transferred'] == True).sum(),
-                'available_pct': ((inventory['is_available'] == True).sum() / len(inventory)) * 100
+                'available': int(is_available.sum()),
+                'transferred': int(datasets['is_transferred'].sum()),
+                'available_pct': (is_available.sum() / n_samples) * 100
             }
         },
         'publications': {
             'total': len(publications),
-            'with_pmid': len([p for p in publications if p.get('pmid') not in ['N/A', None]]),
-            'with_study_code': len([p for p in publications if p.get('biobank_study_code') != 'Unknown']),
+            'with_pmid': publication_summary['with_pmid'],
+            'with_study_code': publication_summary['with_study_code'],
             'coverage_by_study': datasets['pub_study_links']['study_code'].value_counts().to_dict() if len(datasets['pub_study_links']) > 0 else {}
         },
         'assays': {
@@ -483,8 +561,7 @@ def main():
 
     # Save validation report
     report_output = output_dir / 'validation_report.json'
-    with open(report_output, 'w') as f:
-        json.dump(validation_report, f, indent=2, default=str)
+    write_json(report_output, validation_report)
     print(f"✓ Saved: {report_output}")
 
     # Save data conflicts CSV
@@ -503,8 +580,7 @@ def main():
 
     # Save quality metrics JSON
     metrics_output = output_dir / 'data_quality_metrics.json'
-    with open(metrics_output, 'w') as f:
-        json.dump(quality_metrics, f, indent=2, default=str)
+    write_json(metrics_output, quality_metrics)
     print(f"✓ Saved: {metrics_output}")
 
     # Generate human-readable summary
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+JSON I/O shared by the data-munging agents
+Uses orjson when it is installed; the stdlib fallback writes the same types
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def json_default(obj):
+    """Serialize values JSON has no type for: pandas NA as null, numpy values as
+    their Python equivalents, anything else as str"""
+    # numpy and pandas are imported only once one of their objects gets here, so
+    # scripts that never hand them over (the locator, the scrubber) load neither
+    package = type(obj).__module__.partition('.')[0]
+    if package == 'pandas':
+        import pandas as pd
+        if obj is pd.NA:
+            return None
+    elif package == 'numpy':
+        import numpy as np
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    return str(obj)
+
+
+def write_json(path, obj):
+    """Write obj as indented JSON"""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, default=json_default, option=orjson.OPT_INDENT_2 | ORJSON_OPTIONS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2, default=json_default)
+
+
+def json_line(obj):
+    """Serialize obj as one newline-terminated NDJSON record"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS) + b'\n'
+    return json.dumps(obj, default=json_default).encode() + b'\n'
+
+
+def read_json(path):
+    """Parse a JSON file"""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals from the stdlib encoder; json accepts those
+    return json.loads(data)